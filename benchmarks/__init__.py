@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+"""benchmarks - performance measurements for monad.
+
+Run from the source directory, for example::
+
+    python -m benchmarks.suite
+    python -m benchmarks.memory
+    python -m benchmarks.decorators
+    python -m benchmarks.imports
+
+or ``make bench`` and ``make bench-memory`` to save the results as JSON.
+"""
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+"""benchmarks.decorators - overhead of decorators over a bare call.
+
+Compares calls of functions decorated by ``maybe``, ``failsafe`` and
+``producer``, with various options, against calling the undecorated
+function, on success and on failure::
+
+    python -m benchmarks.decorators [number]
+"""
+from __future__ import print_function
+
+import sys
+from timeit import repeat
+
+from monad.decorators import failsafe, maybe, producer
+
+
+def best(function, number):
+    """Returns the best time of ``function`` in seconds per call."""
+    return min(repeat(function, number=number, repeat=5)) / number
+
+
+def bare(text):
+    """Undecorated call, with the exception handled by the caller."""
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+def pair(n):
+    """Returns a pair of items."""
+    return (n, n)
+
+
+def main(number=100000):
+    """Prints time per call, and overhead relative to a bare call."""
+    positive = lambda n: n > 0
+    cases = [
+        ('bare', bare),
+        ('maybe', maybe(int)),
+        ('maybe, predicate', maybe(int, predicate=positive)),
+        ('maybe, value', maybe(int, nothing_on_value=0)),
+        ('failsafe', failsafe(int)),
+        ('failsafe, predicate', failsafe(int, predicate=positive)),
+        ('failsafe, cache', failsafe(int, cache=128)),
+    ]
+    row = '{:<24} {:>10} {:>10} {:>10}'.format
+    print(row('case', 'ok ns', 'error ns', 'overhead'))
+    baseline = None
+    for name, function in cases:
+        success = best(lambda: function('42'), number)
+        failure = best(lambda: function('x'), number // 10)
+        baseline = baseline or success
+        print(row(name,
+                  '{:.0f}'.format(success * 1e9),
+                  '{:.0f}'.format(failure * 1e9),
+                  '{:+.0f}'.format((success - baseline) * 1e9)))
+
+    spawn = producer(pair)
+    print()
+    print(row('case', 'ns', '', 'overhead'))
+    baseline = best(lambda: iter(pair(1)), number)
+    for name, function in [('bare', lambda: iter(pair(1))),
+                           ('producer.iterate', lambda: spawn.iterate(1)),
+                           ('producer', lambda: spawn(1))]:
+        elapsed = best(function, number)
+        print(row(name, '{:.0f}'.format(elapsed * 1e9), '',
+                  '{:+.0f}'.format((elapsed - baseline) * 1e9)))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
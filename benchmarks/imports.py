@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+"""benchmarks.imports - import time of monad, with ``-X importtime``.
+
+Each statement is run in a new interpreter, the time spent importing the
+modules of monad, and the number of them loaded, are reported::
+
+    python -m benchmarks.imports [--repeat N]
+
+Python 3.7 or higher is required.
+"""
+from __future__ import print_function
+
+import argparse
+import subprocess
+import sys
+
+#: Statements measured, in new interpreters.
+STATEMENTS = [
+    'import monad',
+    'from monad import Just',
+    'from monad import maybe',
+    'from monad import List',
+    'import monad.types; from monad.types import *',
+    'import monad.actions',
+]
+
+
+def import_times(statement):
+    """Returns a dict of module name to self import time in microseconds."""
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stderr=subprocess.STDOUT, universal_newlines=True)
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or '[us]' in line:
+            continue
+        self_time, _, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(self_time)
+    return times
+
+
+def monad_time(statement, repeat=5):
+    """Returns the best total time of monad modules, and their number."""
+    best = None
+    for _ in range(repeat):
+        times = import_times(statement)
+        modules = [name for name in times
+                   if name == 'monad' or name.startswith('monad.')]
+        total = sum(times[name] for name in modules)
+        if best is None or total < best[0]:
+            best = total, len(modules)
+    return best
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='runs per statement, the best one is kept')
+    args = parser.parse_args(argv)
+
+    row = '{:<48} {:>10} {:>8}'.format
+    print(row('statement', 'us', 'modules'))
+    for statement in STATEMENTS:
+        total, modules = monad_time(statement, args.repeat)
+        print(row(statement, total, modules))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+"""benchmarks.iteration - cost of iterating List and LazySequence.
+
+Compares iterating over ``List`` and ``LazySequence``, both when items are
+pulled from the source and when they are already cached, against iterating
+over a plain ``list``::
+
+    python -m benchmarks.iteration [size]
+"""
+from __future__ import print_function
+
+import sys
+from timeit import repeat
+
+from monad.types import LazySequence, List
+
+
+def best(function, number=20):
+    """Returns the best time of ``function`` in seconds per call."""
+    return min(repeat(function, number=number, repeat=5)) / number
+
+
+def consume(iterable):
+    """Iterates over ``iterable``."""
+    for _ in iterable:
+        pass
+
+
+def main(size=100000):
+    """Prints iteration cost per item, relative to plain list."""
+    source = list(range(size))
+    cached_seq = LazySequence(source)
+    cached_list = List.from_iterable(source)
+    consume(cached_seq)
+    consume(cached_list)
+
+    cases = [
+        ('list', lambda: consume(source)),
+        ('LazySequence, cached', lambda: consume(cached_seq)),
+        ('LazySequence, fresh', lambda: consume(LazySequence(source))),
+        ('List, cached', lambda: consume(cached_list)),
+        ('List, fresh', lambda: consume(List.from_iterable(source))),
+    ]
+    baseline = None
+    row = '{:<24} {:>12} {:>8}'.format
+    print(row('case', 'ns/item', 'ratio'))
+    for name, function in cases:
+        elapsed = best(function)
+        baseline = baseline or elapsed
+        print(row(name,
+                  '{:.1f}'.format(elapsed / size * 1e9),
+                  '{:.2f}'.format(elapsed / baseline)))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
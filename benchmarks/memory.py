@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+"""benchmarks.memory - memory footprint of monad types and workloads.
+
+Compares the slotted layout of the monad types against a plain object that
+keeps ``value`` in an instance ``__dict__``, which is the layout every monad
+instance had before ``__slots__`` was introduced.
+
+Then measures, with ``tracemalloc``, the peak and retained memory of a set of
+standard workloads, reported in bytes per element::
+
+    python -m benchmarks.memory [--count N] [--output memory.json]
+"""
+from __future__ import print_function
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import tracemalloc
+
+from monad import VERSION
+from monad.decorators import failsafe
+from monad.types import Identity, Just, Left, List, Right
+
+TYPES = [Identity, Just, Left, Right]
+
+#: Registered workloads, in order of registration.
+WORKLOADS = []
+
+
+class Unslotted(object):
+    """Stand-in for the ``__dict__`` based layout of ``Functor``."""
+    # pylint: disable = too-few-public-methods
+    def __init__(self, value):
+        self.value = value
+
+
+def bytes_per_instance(cls, count):
+    """Measures the average allocation of ``count`` instances of ``cls``."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        # small integers are cached, so only the wrappers are measured
+        instances = [cls(0) for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # the list holding the instances is not part of the instances
+    overhead = sys.getsizeof(instances)
+    return (after - before - overhead) / float(count)
+
+
+def layout(count):
+    """Prints a table of bytes per instance, with and without ``__slots__``."""
+    dict_size = bytes_per_instance(Unslotted, count)
+    row = '{:<10} {:>12} {:>12} {:>8}'.format
+    print(row('type', '__dict__', '__slots__', 'saved'))
+    for cls in TYPES:
+        slot_size = bytes_per_instance(cls, count)
+        print(row(cls.__name__,
+                  '{:.1f}'.format(dict_size),
+                  '{:.1f}'.format(slot_size),
+                  '{:.0%}'.format(1 - slot_size / dict_size)))
+
+
+def workload(name):
+    """Registers a workload.
+
+    A workload is called with the number of elements, returns the object to
+    be retained, and the number of elements it actually holds.
+    """
+    def register(function):
+        """Adds ``function`` to ``WORKLOADS``."""
+        WORKLOADS.append((name, function))
+        return function
+    return register
+
+
+@workload('int, baseline')
+def ints(count):
+    """Plain list of ints, the baseline of workloads holding ints."""
+    return list(range(count)), count
+
+
+@workload('Just')
+def justs(count):
+    """List of ``Just`` values."""
+    return [Just(n) for n in range(count)], count
+
+
+@workload('Right')
+def rights(count):
+    """List of ``Right`` values."""
+    return [Right(n) for n in range(count)], count
+
+
+@workload('List.from_iterable')
+def list_from_iterable(count):
+    """Fully evaluated ``List`` over a stream."""
+    stream = List.from_iterable(iter(range(count)))
+    for _ in stream:
+        pass
+    return stream, count
+
+
+@workload('List.from_iterable, window')
+def list_from_iterable_window(count):
+    """``List`` streaming with a window of 1000 items."""
+    stream = List.from_iterable(iter(range(count)), window=1000)
+    for _ in stream:
+        pass
+    return stream, count
+
+
+@workload('List bind tree')
+def list_bind_tree(count):
+    """Evaluated ``List`` of 8 levels of binds, each doubling items.
+
+    Items are new floats, rather than small integers, which are shared, so
+    that the items are measured too.
+    """
+    width = max(count >> 8, 1)
+    spawn = lambda n: List(n - 0.5, n + 0.5)
+    tree = List.from_iterable(float(n) for n in range(width))
+    for _ in range(8):
+        tree = tree >> spawn
+    return tree, len(list(tree))
+
+
+@workload('failsafe Left')
+def failsafe_lefts(count):
+    """List of ``Left`` values holding exceptions from ``failsafe``."""
+    parse = failsafe(int)
+    return [parse('invalid') for _ in range(count)], count
+
+
+def measure(function, count):
+    """Returns elements, peak and retained bytes of running a workload."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        retained, elements = function(count)
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del retained
+    return elements, peak - before, current - before
+
+
+def workloads(count, names=None):
+    """Prints and returns peak and retained memory of workloads."""
+    results = {}
+    row = '{:<28} {:>10} {:>14} {:>14} {:>10}'.format
+    print(row('workload', 'elements', 'peak', 'retained', 'B/elem'))
+    for name, function in WORKLOADS:
+        if names and not any(name.startswith(n) for n in names):
+            continue
+        elements, peak, retained = measure(function, count)
+        per_element = retained / float(elements)
+        results[name] = {
+            'elements': elements,
+            'peak': peak,
+            'retained': retained,
+            'bytes_per_element': per_element,
+        }
+        print(row(name, elements, peak, retained,
+                  '{:.1f}'.format(per_element)))
+    return results
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('names', nargs='*',
+                        help='run workloads with names starting with these')
+    parser.add_argument('--count', type=int, default=1000000,
+                        help='number of elements per workload')
+    parser.add_argument('--output', help='write results as JSON to file')
+    args = parser.parse_args(argv)
+
+    layout(min(args.count, 100000))
+    print()
+    report = {
+        'monad': VERSION,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'count': args.count,
+        'results': workloads(args.count, args.names),
+    }
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+"""benchmarks.suite - micro-benchmarks of core monad operations.
+
+Results are written as JSON, so that they can be compared across releases::
+
+    python -m benchmarks.suite --output before.json
+    python -m benchmarks.suite --compare before.json --max-ratio 1.2
+
+With ``--compare``, the exit status is non-zero if any benchmark is slower
+than the baseline by more than ``--max-ratio``.
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import pickle
+import platform
+import sys
+from functools import reduce
+from operator import rshift
+from timeit import default_timer
+
+from monad import VERSION
+from monad.actions import traverse
+from monad.decorators import failsafe, maybe, monadic, producer
+from monad.serialization import decode_eithers, encode_eithers
+from monad.types import Function, Identity, Just, LazySequence, Left, List
+from monad.types import Right
+
+#: Registered benchmarks, name to setup function, in order of registration.
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """Registers a setup function, which returns the callable to measure."""
+    def register(setup):
+        """Adds ``setup`` to ``BENCHMARKS``."""
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+def measure(function, min_time=0.2, repeat=5):
+    """Returns the best time in seconds per call of ``function``.
+
+    The number of calls per round grows until a round takes at least
+    ``min_time`` seconds.
+    """
+    number = 1
+    while True:
+        start = default_timer()
+        for _ in range(number):
+            function()
+        elapsed = default_timer() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    timings = [elapsed]
+    for _ in range(repeat - 1):
+        start = default_timer()
+        for _ in range(number):
+            function()
+        timings.append(default_timer() - start)
+    return min(timings) / number, number
+
+
+def inc_just(n):
+    """Maybe monadic increment."""
+    return Just(n + 1)
+
+
+def inc_right(n):
+    """Either monadic increment."""
+    return Right(n + 1)
+
+
+def inc_identity(n):
+    """Identity monadic increment."""
+    return Identity(n + 1)
+
+
+@benchmark('maybe.construct')
+def maybe_construct():
+    """Just construction."""
+    return lambda: Just(1)
+
+
+@benchmark('maybe.bind')
+def maybe_bind():
+    """Bind on Just."""
+    m = Just(1)
+    return lambda: m >> inc_just
+
+
+@benchmark('either.construct')
+def either_construct():
+    """Right construction."""
+    return lambda: Right(1)
+
+
+@benchmark('either.bind')
+def either_bind():
+    """Bind on Right."""
+    m = Right(1)
+    return lambda: m >> inc_right
+
+
+@benchmark('identity.construct')
+def identity_construct():
+    """Identity construction."""
+    return lambda: Identity(1)
+
+
+@benchmark('identity.bind')
+def identity_bind():
+    """Bind on Identity."""
+    m = Identity(1)
+    return lambda: m >> inc_identity
+
+
+def kleisli(depth):
+    """Setup of Kleisli composition of ``depth`` stages."""
+    def setup():
+        """Composes ``depth`` monadic functions."""
+        action = reduce(rshift, [monadic(inc_just)] * depth)
+        return lambda: action(0)
+    return setup
+
+
+for _depth in (2, 10, 30):
+    benchmark('monadic.kleisli.depth-%d' % _depth)(kleisli(_depth))
+
+
+@benchmark('monadic.kleisli.compose-30')
+def kleisli_compose():
+    """Kleisli composition of 30 monadic functions."""
+    stages = [monadic(inc_just)] * 30
+    return lambda: reduce(rshift, stages)
+
+
+@benchmark('function.compose-20')
+def function_compose():
+    """Calling 20 functions composed with ``*``."""
+    add_1 = Function(lambda n: n + 1)
+    composed = reduce(lambda f, g: f * g, [add_1] * 20)
+    return lambda: composed(0)
+
+
+@benchmark('function.pipe-20')
+def function_pipe():
+    """Calling 20 functions piped with ``|``."""
+    add_1 = Function(lambda n: n + 1)
+    piped = reduce(lambda f, g: f | g, [add_1] * 20)
+    return lambda: piped(0)
+
+
+@benchmark('list.bind.fan-out')
+def list_bind_fan_out():
+    """Two binds, each spawning three items per item."""
+    source = List.from_iterable(range(100))
+    spawn = lambda n: List(n, n + 1, n + 2)
+    return lambda: list(source >> spawn >> spawn)
+
+
+@benchmark('list.iterate.fresh')
+def list_iterate_fresh():
+    """Iterating over a List not evaluated yet."""
+    source = list(range(1000))
+    return lambda: list(List.from_iterable(iter(source)))
+
+
+@benchmark('list.iterate.cached')
+def list_iterate_cached():
+    """Iterating over an evaluated List."""
+    cached = List.from_iterable(range(1000))
+    list(cached)
+    return lambda: list(cached)
+
+
+@benchmark('lazysequence.index')
+def lazysequence_index():
+    """Indexing forward into a LazySequence."""
+    source = list(range(1000))
+
+    def index():
+        """Indexes a new sequence forward."""
+        seq = LazySequence(iter(source))
+        for position in range(0, 1000, 10):
+            seq[position]
+    return index
+
+
+@benchmark('lazysequence.slice')
+def lazysequence_slice():
+    """Slicing an evaluated LazySequence."""
+    seq = LazySequence(range(1000))
+    return lambda: list(seq[100:900:3])
+
+
+@benchmark('decorators.baseline')
+def decorators_baseline():
+    """Calling an undecorated function, handling the exception."""
+    def parse(text):
+        """Parses ``text`` as int, or returns None."""
+        try:
+            return int(text)
+        except ValueError:
+            return None
+    return lambda: (parse('42'), parse('x'))
+
+
+@benchmark('decorators.maybe')
+def decorators_maybe():
+    """Calling a function decorated by maybe."""
+    parse = maybe(int)
+    return lambda: (parse('42'), parse('x'))
+
+
+@benchmark('decorators.maybe.predicate')
+def decorators_maybe_predicate():
+    """Calling a function decorated by maybe, with a predicate."""
+    parse = maybe(int, predicate=lambda n: n > 0)
+    return lambda: (parse('42'), parse('x'))
+
+
+@benchmark('decorators.failsafe')
+def decorators_failsafe():
+    """Calling a function decorated by failsafe."""
+    parse = failsafe(int)
+    return lambda: (parse('42'), parse('x'))
+
+
+@benchmark('decorators.producer')
+def decorators_producer():
+    """Binding a generator decorated by producer."""
+    @producer
+    def spawn(n):
+        """Yields three items."""
+        yield n
+        yield n + 1
+        yield n + 2
+    source = List.from_iterable(range(100))
+    return lambda: list(source >> spawn)
+
+
+@benchmark('serialization.pickle-1000')
+def serialization_pickle():
+    """Pickling and unpickling 1000 results of Either."""
+    eithers = [Right(n) if n % 7 else Left(n) for n in range(1000)]
+    return lambda: pickle.loads(pickle.dumps(eithers, -1))
+
+
+@benchmark('serialization.encode-1000')
+def serialization_encode():
+    """Encoding and decoding 1000 results of Either."""
+    eithers = [Right(n) if n % 7 else Left(n) for n in range(1000)]
+    return lambda: decode_eithers(encode_eithers(eithers))
+
+
+@benchmark('actions.traverse-1000')
+def actions_traverse():
+    """Traversing 1000 items, with a function returning Right."""
+    items = list(range(1000))
+    return lambda: traverse(inc_right, items)
+
+
+@benchmark('actions.traverse-1000.reduce')
+def actions_traverse_reduce():
+    """Traversing 1000 items, by binding in a loop, for comparison."""
+    items = list(range(1000))
+
+    def step(acc, n):
+        return acc >> (lambda xs: inc_right(n) >> (
+            lambda x: Right(xs + [x])))
+    return lambda: reduce(step, items, Right([]))
+
+
+def run(names=None, min_time=0.2, repeat=5, stream=sys.stdout):
+    """Runs benchmarks, all of them, or those with name starting ``names``.
+
+    Returns a dict ready to be dumped as JSON.
+    """
+    results = {}
+    for name, setup in BENCHMARKS:
+        if names and not any(name.startswith(n) for n in names):
+            continue
+        seconds, number = measure(setup(), min_time, repeat)
+        results[name] = {'seconds': seconds, 'number': number}
+        print('{:<32} {:>12.3f} us'.format(name, seconds * 1e6), file=stream)
+    return {
+        'monad': VERSION,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'results': results,
+    }
+
+
+def compare(report, baseline, max_ratio, stream=sys.stdout):
+    """Prints ratios of ``report`` to ``baseline``, returns the failed."""
+    failed = []
+    for name in sorted(report['results']):
+        if name not in baseline['results']:
+            continue
+        ratio = (report['results'][name]['seconds'] /
+                 baseline['results'][name]['seconds'])
+        verdict = 'SLOWER' if ratio > max_ratio else ''
+        if verdict:
+            failed.append(name)
+        print('{:<32} {:>8.2f}x {}'.format(name, ratio, verdict), file=stream)
+    return failed
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('names', nargs='*',
+                        help='run benchmarks with names starting with these')
+    parser.add_argument('--output', help='write results as JSON to file')
+    parser.add_argument('--compare', help='JSON results to compare against')
+    parser.add_argument('--max-ratio', type=float, default=1.2,
+                        help='fail if slower than baseline by this ratio')
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='minimum seconds per round of measurement')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='rounds of measurement, the best one is kept')
+    args = parser.parse_args(argv)
+
+    # progress goes to stderr when JSON goes to stdout
+    stream = sys.stderr if args.output == '-' else sys.stdout
+    report = run(args.names, args.min_time, args.repeat, stream)
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+    elif args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as baseline:
+            failed = compare(report, json.load(baseline), args.max_ratio,
+                             stream)
+        if failed:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
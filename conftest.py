@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+import sys
+
+collect_ignore = []
+
+if sys.version_info < (3, 5):
+    # async syntax
+    collect_ignore.extend([
+        'monad/types/asynchronous.py',
+        'tests/test_asynchronous.py',
+    ])
+
+try:
+    import numpy
+except ImportError:
+    # optional dependency of monad.types.batch
+    collect_ignore.append('monad/types/batch.py')
+else:
+    del numpy
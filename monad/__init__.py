@@ -3,10 +3,60 @@
 # License: BSD New, see LICENSE for details.
 """monad - a functional library"""
 
+import sys
+
 __version__ = (0, 2)
 __release__ = '.dev'
 
 VERSION = '%d.%d' % __version__ + __release__
 
-__all__ = [
-]
+#: Names exported, and the modules defining them, loaded when first used.
+EXPORTS = {
+    'Maybe': 'monad.types',
+    'Just': 'monad.types',
+    'Nothing': 'monad.types',
+    'Either': 'monad.types',
+    'Left': 'monad.types',
+    'Right': 'monad.types',
+    'Identity': 'monad.types',
+    'List': 'monad.types',
+    'Function': 'monad.types',
+    'Monadic': 'monad.types',
+    'function': 'monad.decorators',
+    'monadic': 'monad.decorators',
+    'maybe': 'monad.decorators',
+    'failsafe': 'monad.decorators',
+    'producer': 'monad.decorators',
+    'trampoline': 'monad.decorators',
+    'either': 'monad.actions',
+    'first': 'monad.actions',
+    'tryout': 'monad.actions',
+    'sequence': 'monad.actions',
+    'traverse': 'monad.actions',
+    'mapM_': 'monad.actions',
+    'foldM': 'monad.actions',
+}
+
+__all__ = sorted(EXPORTS)
+
+
+def __getattr__(name):
+    """Imports exported names on first access, see PEP 562."""
+    if name not in EXPORTS:
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, name))
+    # __import__ rather than importlib, so that -X importtime reports it
+    value = getattr(__import__(EXPORTS[name], fromlist=[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(EXPORTS))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # no module __getattr__, load everything
+    for _name in __all__:
+        globals()[_name] = __getattr__(_name)
+    del _name
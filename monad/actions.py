@@ -3,10 +3,12 @@
 # License: BSD New, see LICENSE for details.
 """monad.actions - useful monadic actions."""
 
+from threading import Lock
+
 from .decorators import function, monadic
 from .types import Either, Left, Right
 from .types import Just, Nothing
-from .utils import identity
+from .utils import identity, now
 
 
 @function
@@ -48,7 +50,7 @@ def either(left_handler, right_handler=identity):
 
 
 @function
-def tryout(*functions):
+def tryout(*functions, **options):
     """Combine functions into one.
 
     Returns a monadic function that when called, will try out functions in
@@ -65,7 +67,40 @@ def tryout(*functions):
     'odd'
     >>> test(2)
     'even'
+
+    With keyword argument ``executor``, a ``concurrent.futures.Executor``,
+    functions are called by the executor, the next one is started as soon as
+    the previous one
+
+    - returns a false value, or raises an exception
+    - takes longer than ``timeout`` seconds, if set, it is then cancelled,
+      if not running yet, and its result ignored
+    - takes longer than ``hedge`` seconds, if set, it is then left running
+
+    The first true value, from whichever function completes first, is
+    returned, and the functions still running are cancelled.  Otherwise the
+    last false value returned, or the last exception raised, by those not
+    timed out, or ``concurrent.futures.TimeoutError`` if all of them timed
+    out.
+
+    For coroutine functions, see :func:`monad.types.asynchronous.atryout`.
     """
+    executor = options.pop('executor', None)
+    timeout = options.pop('timeout', None)
+    hedge = options.pop('hedge', None)
+    if options:
+        raise TypeError('unexpected keyword arguments: {}'.format(
+            ', '.join(sorted(options))))
+    if executor is None and (timeout is not None or hedge is not None):
+        raise TypeError('timeout and hedge require an executor')
+
+    if executor is not None:
+        @monadic
+        def trying_concurrently(*args, **kwargs):
+            """Monadic function that try out functions by executor."""
+            return hedged(executor, functions, args, kwargs, timeout, hedge)
+        return trying_concurrently
+
     @monadic
     def trying(*args, **kwargs):
         """Monadic function that try out functions in order."""
@@ -78,6 +113,206 @@ def tryout(*functions):
     return trying
 
 
+def hedged(executor, functions, args, kwargs, timeout=None, hedge=None):
+    """Calls ``functions`` by ``executor`` until one returns a true value.
+
+    See :func:`tryout`.
+    """
+    # pylint: disable = star-args, too-many-branches
+    # import here, concurrent.futures is not available in python 2
+    from concurrent.futures import FIRST_COMPLETED, TimeoutError, wait
+
+    candidates = iter(functions)
+    running = {}
+    last_result, last_error = None, None
+    # whether any candidate returned or raised, or timed out
+    answered = timed_out = False
+
+    def start():
+        """Starts the next candidate, returns false if there is none."""
+        for candidate in candidates:
+            future = executor.submit(candidate, *args, **kwargs)
+            running[future] = None if timeout is None else now() + timeout
+            return True
+        return False
+
+    last_start = now()
+    remaining = start()
+    try:
+        while running:
+            wakeups = [deadline for deadline in running.values()
+                       if deadline is not None]
+            if hedge is not None and remaining:
+                wakeups.append(last_start + hedge)
+            wait_for = max(min(wakeups) - now(), 0) if wakeups else None
+            done, _ = wait(list(running), wait_for, FIRST_COMPLETED)
+            start_next = False
+            for future in done:
+                del running[future]
+                start_next = answered = True
+                try:
+                    result = future.result()
+                except Exception as ex:  # pylint: disable = broad-except
+                    last_error = ex
+                    continue
+                if result:
+                    return result
+                last_result, last_error = result, None
+            current = now()
+            for future, deadline in list(running.items()):
+                if deadline is not None and deadline <= current:
+                    future.cancel()
+                    del running[future]
+                    start_next = timed_out = True
+            if hedge is not None and current >= last_start + hedge:
+                start_next = True
+            if start_next and remaining:
+                last_start = current
+                remaining = start()
+    finally:
+        for future in running:
+            future.cancel()
+    if timed_out and not answered:
+        raise TimeoutError()
+    if last_error is not None:
+        raise last_error
+    return last_result
+
+
+class CandidateStats(object):
+    """Statistics of a candidate of :func:`adaptive_tryout`.
+
+    Observations lose half of their weight every ``half_life`` seconds, or
+    never, if ``half_life`` is ``None``.
+    """
+    def __init__(self, function, half_life=None):
+        self.function = function
+        self.half_life = half_life
+        self.calls = 0.0
+        self.successes = 0.0
+        self.seconds = 0.0
+        self.updated = None
+
+    def __repr__(self):
+        return ('CandidateStats({}, calls={:.2f}, success_rate={:.2f}, '
+                'mean_seconds={:.6f})').format(
+                    getattr(self.function, '__name__', self.function),
+                    self.calls, self.success_rate, self.mean_seconds)
+
+    def record(self, success, seconds, at):
+        """Adds a call, taking ``seconds``, finished at time ``at``."""
+        if self.updated is not None and self.half_life:
+            weight = 0.5 ** ((at - self.updated) / float(self.half_life))
+            self.calls *= weight
+            self.successes *= weight
+            self.seconds *= weight
+        self.updated = at
+        self.calls += 1
+        self.successes += 1 if success else 0
+        self.seconds += seconds
+
+    @property
+    def success_rate(self):
+        """Estimated probability of success, 0.5 before the first call."""
+        return (self.successes + 1) / (self.calls + 2)
+
+    @property
+    def mean_seconds(self):
+        """Mean seconds per call, 0 before the first call."""
+        return self.seconds / self.calls if self.calls else 0.0
+
+    @property
+    def cost(self):
+        """Expected seconds spent per success, the key of ordering."""
+        return self.mean_seconds / self.success_rate
+
+
+class Candidates(object):
+    """Functions of :func:`adaptive_tryout`, and their statistics.
+
+    Unless ``pinned``, functions are tried in ascending order of ``cost``,
+    which minimizes the expected time to the first success, given that
+    they succeed independently.  Functions never called go first, in the
+    order given.
+    """
+    def __init__(self, functions, half_life=None, pinned=False, timer=now):
+        self.stats = [CandidateStats(f, half_life) for f in functions]
+        self.pinned = pinned
+        self.timer = timer
+        self.lock = Lock()
+
+    def order(self):
+        """Returns :class:`CandidateStats` in order of attempts."""
+        if self.pinned:
+            return list(self.stats)
+        with self.lock:
+            return sorted(self.stats, key=lambda stats: stats.cost)
+
+    def record(self, stats, success, start):
+        """Adds a call of candidate ``stats``, started at ``start``."""
+        finish = self.timer()
+        with self.lock:
+            stats.record(success, finish - start, finish)
+
+    def __call__(self, *args, **kwargs):
+        # pylint: disable = star-args
+        last = None
+        for stats in self.order():
+            start = self.timer()
+            try:
+                last = stats.function(*args, **kwargs)
+            except Exception:
+                self.record(stats, False, start)
+                raise
+            self.record(stats, last, start)
+            if last:
+                break
+        return last
+
+
+@function
+def adaptive_tryout(*functions, **options):
+    """Combine functions into one, reordered by how well they do.
+
+    Same as :func:`tryout`, except that functions are tried in order of
+    expected time spent per success, estimated from previous calls, see
+    :class:`Candidates`.  Keyword arguments:
+
+    - ``half_life``, in seconds, of the statistics, defaults to ``None``,
+      never decaying
+    - ``pinned``, if true, functions are tried in the order given, while
+      statistics are still collected, defaults to ``False``
+    - ``timer``, function returning the current time in seconds
+
+    The :class:`Candidates` are available as attribute ``candidates`` of
+    the returned monadic function.
+
+    >>> from itertools import count
+    >>> ticks = count()
+    >>> clock = lambda: next(ticks)  # every call takes a second
+    >>> zero = lambda n: 'zero' if n == 0 else False
+    >>> odd = lambda n: 'odd' if n % 2 else False
+    >>> test = adaptive_tryout(zero, odd, timer=clock)
+    >>> [test(n) for n in (1, 3, 5, 0)]
+    ['odd', 'odd', 'odd', 'zero']
+    >>> [stats.function for stats in test.candidates.order()] == [odd, zero]
+    True
+    >>> test.candidates.stats[1].calls
+    4.0
+    """
+    half_life = options.pop('half_life', None)
+    pinned = options.pop('pinned', False)
+    timer = options.pop('timer', now)
+    if options:
+        raise TypeError('unexpected keyword arguments: {}'.format(
+            ', '.join(sorted(options))))
+
+    candidates = Candidates(functions, half_life, pinned, timer)
+    trying = monadic(candidates)
+    trying.candidates = candidates
+    return trying
+
+
 @monadic
 def first(sequence, default=Nothing, predicate=None):
     """Iterate over a sequence, return the first ``Just``.
@@ -132,6 +367,154 @@ def first(sequence, default=Nothing, predicate=None):
     return default
 
 
+@monadic
+def first_completed(futures, default=Nothing, predicate=None, timeout=None):
+    """Return the first ``Just`` of ``futures``, in order of completion.
+
+    Same as :func:`first`, for results of ``concurrent.futures.Future``,
+    taken as they complete, futures raising exceptions are skipped.  Once a
+    result is found, or ``timeout`` seconds have passed, the remaining
+    futures are cancelled, those already running are left to finish.
+
+    For awaitables, see :func:`monad.types.asynchronous.afirst`.
+    """
+    # import here, concurrent.futures is not available in python 2
+    from concurrent.futures import TimeoutError, as_completed
+
+    if predicate is None:
+        predicate = lambda m: m and isinstance(m, Just)
+
+    futures = list(futures)
+    try:
+        for future in as_completed(futures, timeout):
+            if future.cancelled() or future.exception() is not None:
+                continue
+            item = future.result()
+            if predicate(item):
+                if not isinstance(item, Just):
+                    item = Just(item)
+                return item
+    except TimeoutError:
+        pass
+    finally:
+        for future in futures:
+            future.cancel()
+    return default
+
+
+# The functions below work with Maybe and Either, where a failure, Nothing
+# or a Left, is false, and a success, Just or Right, true, whatever its value.
+
+@monadic
+def sequence(monads, unit=Just):
+    """Collect values of ``monads``, :class:`Maybe` or :class:`Either`.
+
+    Returns a :class:`Just` or a :class:`Right` of the list of values, or
+    the first :data:`Nothing` or :class:`Left`, without taking the rest of
+    ``monads``, which can be any iterable.  If ``monads`` is empty, returns
+    ``unit([])``.
+
+    >>> from monad.types import Just, Nothing, Left, Right
+    >>> sequence([Just(1), Just(2), Just(3)])
+    Just([1, 2, 3])
+    >>> sequence(Just(n) if n < 3 else Nothing for n in range(10))
+    Nothing
+    >>> sequence([Right(1), Left('error'), Left('another')])
+    Left('error')
+    >>> sequence([], unit=Right)
+    Right([])
+    """
+    values = []
+    append = values.append
+    monad = None
+    for monad in monads:
+        if not monad:
+            return monad
+        append(monad.value)
+    return unit(values) if monad is None else monad.unit(values)
+
+
+@monadic
+def traverse(function, iterable, unit=Just):
+    """Map ``function``, returning :class:`Maybe` or :class:`Either`, over
+    ``iterable``, collect the values.
+
+    Same as ``sequence(function(item) for item in iterable)``, stopping at
+    the first failure.
+
+    >>> from monad.decorators import maybe
+    >>> traverse(maybe(int), ['1', '2', '3'])
+    Just([1, 2, 3])
+    >>> traverse(maybe(int), ['1', 'x', '3'])
+    Nothing
+    """
+    values = []
+    append = values.append
+    monad = None
+    for item in iterable:
+        monad = function(item)
+        if not monad:
+            return monad
+        append(monad.value)
+    return unit(values) if monad is None else monad.unit(values)
+
+
+@monadic
+def mapM_(function, iterable, unit=Just):
+    """Call ``function``, returning :class:`Maybe` or :class:`Either`, with
+    items of ``iterable``, for effects.
+
+    Returns the first failure, or a :class:`Just` or a :class:`Right` of
+    ``None``, no values are collected.  If ``iterable`` is empty, returns
+    ``unit(None)``.
+
+    >>> from monad.types import Left, Right
+    >>> def check(n):
+    ...     return Right(n) if n >= 0 else Left(n)
+    >>> mapM_(check, [1, 2, 3])
+    Right(None)
+    >>> mapM_(check, [1, -2, -3])
+    Left(-2)
+    """
+    # pylint: disable = invalid-name
+    monad = None
+    for item in iterable:
+        monad = function(item)
+        if not monad:
+            return monad
+    return unit(None) if monad is None else monad.unit(None)
+
+
+@monadic
+def foldM(function, initial, iterable, unit=Just):
+    """Fold ``iterable`` with ``function``, returning :class:`Maybe` or
+    :class:`Either`.
+
+    ``function`` is called with the accumulated value and an item, returns
+    the monad of the next accumulated value.  Returns the last monad, or
+    the first failure, or ``unit(initial)`` if ``iterable`` is empty.
+
+    >>> from monad.types import Just, Nothing
+    >>> def safe_div(n, d):
+    ...     return Just(n // d) if d else Nothing
+    >>> foldM(safe_div, 1000, [2, 5, 10])
+    Just(10)
+    >>> foldM(safe_div, 1000, [2, 0, 10])
+    Nothing
+    >>> foldM(safe_div, 1000, [])
+    Just(1000)
+    """
+    # pylint: disable = invalid-name
+    monad = None
+    value = initial
+    for item in iterable:
+        monad = function(value, item)
+        if not monad:
+            return monad
+        value = monad.value
+    return unit(initial) if monad is None else monad
+
+
 # As decorators function and monadic turn decorated functions into Function
 # and Monadic instance objects, respectively, doctest will ignore docstring in
 # them, the following adds those docstring into testsuite back again,
@@ -139,5 +522,11 @@ def first(sequence, default=Nothing, predicate=None):
 __test__ = {
     'either': either.__doc__,
     'tryout': tryout.__doc__,
+    'adaptive_tryout': adaptive_tryout.__doc__,
     'first': first.__doc__,
+    'first_completed': first_completed.__doc__,
+    'sequence': sequence.__doc__,
+    'traverse': traverse.__doc__,
+    'mapM_': mapM_.__doc__,
+    'foldM': foldM.__doc__,
 }
@@ -3,7 +3,12 @@
 # License: BSD New, see LICENSE for details.
 """monad.decorators - helpful decorators."""
 
+import sys
+from collections import deque
+from copy import copy
 from functools import partial, wraps
+from itertools import count, islice
+from threading import local
 
 from .exceptions import ExtractError
 from .types import Null
@@ -11,8 +16,11 @@ from .types import Function
 from .types import Monadic
 from .types import Just, Nothing
 from .types import Left, Right
-from .types import List
-from .utils import ignore_exception_set, suppress
+from .utils import LRUCache, TailCall, ignore_exception_set
+from .utils import strip_traceback
+
+#: Separates positional from keyword arguments in keys of :func:`memoize`.
+KWARGS_MARK = object()
 
 
 def function(callable_object):
@@ -41,7 +49,9 @@ def monadic(callable_object):
 def maybe(callable_object=None,
           predicate=None,
           nothing_on_value=Null,
-          nothing_on_exception=Exception):
+          nothing_on_exception=Exception,
+          cache=None,
+          cache_failures=True):
     """Transform a callable into a function returns a :py:class:`Maybe`.
 
     >>> parse_int = maybe(int)
@@ -103,34 +113,63 @@ def maybe(callable_object=None,
     - any combination of the above
 
     Otherwise, the result will be wrapped in a :py:class:`Just`.
+
+    ``cache`` can be set to the maximum number of results to be memoized, or
+    an :class:`~monad.utils.LRUCache`, for pure functions with repeated
+    arguments.  :data:`Nothing` is memoized too, unless ``cache_failures``
+    is false.  The cache is available as attribute ``cache`` of the returned
+    function.
+
+    >>> parse_cached = maybe(int, cache=128)
+    >>> parse_cached('42'), parse_cached('42'), parse_cached('x')
+    (Just(42), Just(42), Nothing)
+    >>> parse_cached.cache.info()
+    CacheInfo(hits=1, misses=2, evictions=0, maxsize=128, currsize=2)
     """
     if callable_object is None:
         return partial(maybe,
                        predicate=predicate,
                        nothing_on_value=nothing_on_value,
-                       nothing_on_exception=nothing_on_exception)
-
-    exceptions = ignore_exception_set(ExtractError, nothing_on_exception)
-
-    @wraps(callable_object)
-    def wrapper(*args, **kwargs):
-        """Monadic function wrapper for Maybe"""
-        # pylint: disable = star-args
-        with suppress(*exceptions):
-            result = callable_object(*args, **kwargs)
-            if nothing_on_value is not Null and result == nothing_on_value:
+                       nothing_on_exception=nothing_on_exception,
+                       cache=cache,
+                       cache_failures=cache_failures)
+
+    # the wrapper is specialized for the options, no checks are done per
+    # call for options not set
+    exceptions = tuple(
+        ignore_exception_set(ExtractError, nothing_on_exception))
+    accept = acceptor(predicate, nothing_on_value)
+
+    if accept is None:
+        def wrapper(*args, **kwargs):
+            """Monadic function wrapper for Maybe"""
+            # pylint: disable = star-args
+            try:
+                return Just(callable_object(*args, **kwargs))
+            except exceptions:
                 return Nothing
-            if predicate is not None and not predicate(result):
+    else:
+        def wrapper(*args, **kwargs):
+            """Monadic function wrapper for Maybe"""
+            # pylint: disable = star-args
+            try:
+                result = callable_object(*args, **kwargs)
+                return Just(result) if accept(result) else Nothing
+            except exceptions:
                 return Nothing
-            return Just(result)
-        return Nothing
+    wrapper = wraps(callable_object)(wrapper)
+
+    if cache is not None:
+        return memoize(wrapper, cache, cache_failures)
     return monadic(wrapper)
 
 
 def failsafe(callable_object=None,
              predicate=None,
              left_on_value=Null,
-             left_on_exception=Exception):
+             left_on_exception=Exception,
+             cache=None,
+             cache_failures=True):
     """Transform a callable into a function returns an :py:class:`Either`.
 
     >>> parse_int = failsafe(int)
@@ -192,40 +231,260 @@ def failsafe(callable_object=None,
     - any combination of the above
 
     Otherwise, the result will be wrapped in a :py:class:`Right`.
+
+    To process items in bulk, without wrapping each result, the returned
+    function has a ``map_partition`` method, which returns values that would
+    be :py:class:`Right` and :py:class:`Left`, with their indices, in two
+    lists.
+
+    >>> rights, lefts = parse_int.map_partition(['1', 'x', '3'])
+    >>> rights
+    [(0, 1), (2, 3)]
+    >>> lefts
+    [(1, ValueError(...))]
+
+    ``cache`` and ``cache_failures`` work as in :func:`maybe`, a memoized
+    :py:class:`Left` of exception holds a copy of the exception, without
+    traceback, so that frames are not kept alive by the cache.
     """
     if callable_object is None:
         return partial(failsafe,
                        predicate=predicate,
                        left_on_value=left_on_value,
-                       left_on_exception=left_on_exception)
+                       left_on_exception=left_on_exception,
+                       cache=cache,
+                       cache_failures=cache_failures)
+
+    exceptions = tuple(ignore_exception_set(left_on_exception))
+    accept = acceptor(predicate, left_on_value)
+
+    if accept is None:
+        def wrapper(*args, **kwargs):
+            """Monadic function wrapper for Either"""
+            # pylint: disable = star-args
+            try:
+                return Right(callable_object(*args, **kwargs))
+            except ExtractError as ex:
+                return left_of(ex)
+            except exceptions as ex:
+                return Left(ex)
+    else:
+        def wrapper(*args, **kwargs):
+            """Monadic function wrapper for Either"""
+            # pylint: disable = star-args
+            try:
+                result = callable_object(*args, **kwargs)
+                return Right(result) if accept(result) else Left(result)
+            except ExtractError as ex:
+                return left_of(ex)
+            except exceptions as ex:
+                return Left(ex)
+    wrapper = wraps(callable_object)(wrapper)
+
+    def map_partition(iterable, executor=None, chunksize=1024):
+        """Applies the function to each item, partitions the results.
+
+        Returns a pair of lists, ``(rights, lefts)``, of ``(index, value)``
+        where ``index`` is the position of the item in ``iterable``, and
+        ``value`` what would have been wrapped in :class:`Right` or
+        :class:`Left`, respectively.
+
+        ``iterable`` is consumed ``chunksize`` items at a time, if
+        ``executor`` is provided, chunks are processed by it, a few at a
+        time.  With a process pool executor, the decorated callable, and
+        ``predicate``, must be picklable, a function decorated at module
+        level is, by reference to the decorated function.
+        """
+        function = callable_object
+        if executor is not None and shadowed(function, monadic_function):
+            function = Unwrapped(function.__module__, qualified_name(function))
+        config = (function, accept, exceptions)
+        items = iter(iterable)
+        chunks = (
+            (start, list(islice(items, chunksize)))
+            for start in count(0, chunksize))
+        rights, lefts = [], []
+        if executor is None:
+            for start, chunk in chunks:
+                if not chunk:
+                    break
+                partition_chunk(config, start, chunk, rights, lefts)
+            return rights, lefts
+
+        pending = deque()
+        for start, chunk in chunks:
+            if not chunk:
+                break
+            pending.append(
+                executor.submit(partition_chunk, config, start, chunk))
+            if len(pending) > 4:
+                merge_partition(pending.popleft().result(), rights, lefts)
+        while pending:
+            merge_partition(pending.popleft().result(), rights, lefts)
+        return rights, lefts
+
+    if cache is not None:
+        monadic_function = memoize(wrapper, cache, cache_failures)
+    else:
+        monadic_function = monadic(wrapper)
+    monadic_function.map_partition = map_partition
+    monadic_function.__wrapped__ = callable_object
+    return monadic_function
+
+
+def qualified_name(function):
+    """Returns the qualified name of ``function``, its name in python 2."""
+    return getattr(function, '__qualname__', None) or function.__name__
+
+
+def resolve(module, name):
+    """Returns the object of qualified ``name`` in ``module``."""
+    __import__(module)
+    value = sys.modules[module]
+    for attr in name.split('.'):
+        value = getattr(value, attr)
+    return value
+
+
+def shadowed(function, decorated):
+    """Returns true if ``function`` has been replaced by ``decorated``,
+    under its own name, as module level decorators do."""
+    try:
+        return resolve(function.__module__, qualified_name(function)) is (
+            decorated)
+    except (AttributeError, ImportError, KeyError, TypeError):
+        return False
+
+
+class Unwrapped(object):
+    """Picklable reference to a function shadowed by its decorated version,
+    called through ``__wrapped__`` of the latter."""
+    # pylint: disable = too-few-public-methods
+    def __init__(self, module, name):
+        self.module = module
+        self.name = name
+        self.function = None
+
+    def __reduce__(self):
+        return type(self), (self.module, self.name)
+
+    def __call__(self, *args, **kwargs):
+        # pylint: disable = star-args
+        if self.function is None:
+            self.function = resolve(self.module, self.name).__wrapped__
+        return self.function(*args, **kwargs)
+
+
+def acceptor(predicate, rejected_value):
+    """Returns a function telling if a result is accepted, or ``None``.
+
+    A result is rejected if it equals ``rejected_value``, unless that is
+    ``Null``, or if ``predicate`` is set and returns false for it.  ``None``
+    is returned if nothing is rejected.  The function is picklable if
+    ``predicate`` is.
+    """
+    if rejected_value is Null:
+        return predicate
+    return Acceptor(predicate, rejected_value)
+
+
+class Acceptor(object):
+    """Function telling if a result is accepted, see :func:`acceptor`."""
+    # pylint: disable = too-few-public-methods
+    def __init__(self, predicate, rejected_value):
+        self.predicate = predicate
+        self.rejected_value = rejected_value
+
+    def __call__(self, result):
+        if result == self.rejected_value:
+            return False
+        return self.predicate is None or self.predicate(result)
+
+
+def left_of(extract_error):
+    """Returns the :py:class:`Left` of an ``ExtractError``, or of itself."""
+    monad = extract_error.monad
+    return monad if isinstance(monad, Left) else Left(extract_error)
+
 
-    exceptions = ignore_exception_set(left_on_exception)
+def memoize(function, cache, cache_failures=True):
+    """Wraps ``function`` returning a monad, with results memoized.
 
-    @wraps(callable_object)
+    ``cache`` is either an :class:`~monad.utils.LRUCache` or its maximum
+    size.  Failures, :data:`Nothing` and :py:class:`Left`, are memoized if
+    ``cache_failures`` is true, exceptions in them as copies without
+    traceback, the caller of the first call gets the original one.
+
+    Calls with unhashable arguments are not memoized.
+    """
+    if not isinstance(cache, LRUCache):
+        cache = LRUCache(cache)
+
+    @wraps(function)
     def wrapper(*args, **kwargs):
-        """Monadic function wrapper for Either"""
+        """Memoizing wrapper"""
+        # pylint: disable = star-args
+        key = args
+        if kwargs:
+            key += (KWARGS_MARK,) + tuple(sorted(kwargs.items()))
         try:
-            result = callable_object(*args, **kwargs)
-            if left_on_value is not Null and result == left_on_value:
-                return Left(result)
-            if predicate is not None and not predicate(result):
-                return Left(result)
-            return Right(result)
-        except ExtractError as ex:
-            monad = ex.monad
-            if isinstance(monad, Left):
-                return ex.monad
+            monad = cache.get(key, Null)
+        except TypeError:
+            return function(*args, **kwargs)
+        if monad is Null:
+            monad = function(*args, **kwargs)
+            cached = monad
+            if monad is Nothing or isinstance(monad, Left):
+                if not cache_failures:
+                    return monad
+                if isinstance(monad.value, BaseException):
+                    try:
+                        cached = Left(strip_traceback(copy(monad.value)))
+                    except Exception:  # pylint: disable = broad-except
+                        # not copyable, not memoized
+                        return monad
+            cache.put(key, cached)
+        return monad
+
+    monadic_function = monadic(wrapper)
+    monadic_function.cache = cache
+    return monadic_function
+
+
+def partition_chunk(config, start, chunk, rights=None, lefts=None):
+    """Partitions results of ``failsafe`` function on ``chunk`` of items.
+
+    Appends ``(index, value)`` to ``rights`` and ``lefts``, returns them.
+    """
+    function, accept, exceptions = config
+    if rights is None:
+        rights, lefts = [], []
+    for index, item in enumerate(chunk, start):
+        # the same as the wrapper of failsafe, without wrapping results
+        try:
+            result = function(item)
+            if accept is None or accept(result):
+                rights.append((index, result))
             else:
-                return Left(ex)
-        except tuple(exceptions) as ex:
-            return Left(ex)
-    return monadic(wrapper)
+                lefts.append((index, result))
+        except ExtractError as ex:
+            lefts.append((index, left_of(ex).value))
+        except exceptions as ex:
+            lefts.append((index, ex))
+    return rights, lefts
+
+
+def merge_partition(partitioned, rights, lefts):
+    """Extends ``rights`` and ``lefts`` with results of a chunk."""
+    rights.extend(partitioned[0])
+    lefts.extend(partitioned[1])
 
 
 def producer(function_or_generator=None,
              empty_on_exception=None):
     """Transform a callable into a producer that when called, returns ``List``.
 
+    >>> from monad.types import List
     >>> @producer
     ... def double(a):
     ...     yield a
@@ -252,13 +511,77 @@ def producer(function_or_generator=None,
     if function_or_generator is None:
         return partial(producer, empty_on_exception=empty_on_exception)
 
-    exceptions = ignore_exception_set(ExtractError, empty_on_exception)
+    # import here, so that List is not loaded unless used
+    from .types import List
+    exceptions = tuple(ignore_exception_set(ExtractError, empty_on_exception))
 
     @wraps(function_or_generator)
     def wrapper(*args, **kwargs):
         """Monadic function wrapper for List"""
         # pylint: disable = star-args
-        with suppress(*exceptions):
+        try:
             return List.from_iterable(function_or_generator(*args, **kwargs))
-        return List.zero
-    return monadic(wrapper)
+        except exceptions:
+            return List.zero
+
+    def iterate(*args, **kwargs):
+        """Same as wrapper, returns an iterator instead of List"""
+        # pylint: disable = star-args
+        try:
+            return iter(function_or_generator(*args, **kwargs))
+        except exceptions:
+            return iter(())
+
+    monadic_function = monadic(wrapper)
+    # used by List.bind to avoid caching items in intermediate List
+    monadic_function.iterate = iterate
+    return monadic_function
+
+
+def trampoline(callable_object):
+    """Transform a recursive monadic function into a stack-safe one.
+
+    Recursive calls made while the function is already running are not
+    evaluated on the spot, but returned as a deferred call, which will be
+    evaluated in a loop by the outermost call, so that recursion of any depth
+    runs in constant stack.
+
+    >>> @trampoline
+    ... def countdown(n):
+    ...     if n == 0:
+    ...         return Just('done')
+    ...     return Just(n - 1) >> countdown
+    >>> countdown(100000)
+    Just('done')
+    >>> @trampoline
+    ... def total(n, acc=0):
+    ...     if n == 0:
+    ...         return Right(acc)
+    ...     if n < 0:
+    ...         return Left(n)
+    ...     return Right(n - 1) >> (lambda m: total(m, acc + n))
+    >>> total(100000)
+    Right(5000050000)
+
+    Recursive calls must be in tail position, that is, their results must be
+    returned as is, either directly, or through ``bind`` (``>>``) of monads
+    that return the result of the bound function unchanged, like
+    :class:`Identity`, :class:`Maybe` and :class:`Either`, otherwise a
+    :exc:`TypeError` is raised.
+    """
+    state = local()
+
+    def call(*args, **kwargs):
+        """Evaluates calls to ``callable_object`` in a loop."""
+        # pylint: disable = star-args
+        if getattr(state, 'running', False):
+            return TailCall(callable_object, args, kwargs)
+        state.running = True
+        try:
+            result = callable_object(*args, **kwargs)
+            while isinstance(result, TailCall):
+                result = result.function(*result.args, **result.kwargs)
+            return result
+        finally:
+            state.running = False
+    return monadic(wraps(callable_object)(call))
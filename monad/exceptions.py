@@ -10,3 +10,13 @@ class ExtractError(Exception):
         super(ExtractError, self).__init__(
             'cannot extract value from {}'.format(repr(monad)))
         self.monad = monad
+
+
+class EvictedError(LookupError):
+    """Raised when accessing an item no longer kept by a bounded sequence."""
+    def __init__(self, index, window):
+        super(EvictedError, self).__init__(
+            'item {} has been evicted, only the last {} kept'.format(
+                index, window))
+        self.index = index
+        self.window = window
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+"""monad.instrument - opt-in timing of bind stages.
+
+While enabled, every bind with ``>>``, and the first stage of a Kleisli
+composition, is timed, and reported to a sink, with the name of the stage,
+and whether it short-circuited, that is, produced ``Nothing`` or a ``Left``.
+When disabled, the cost is one attribute check per bind.  Stages skipped
+after a short-circuit are not reported, neither are stages of
+:mod:`monad.types.asynchronous`, as coroutine functions return before their
+work is done.
+
+>>> from monad.types import Just, Nothing
+>>> def half(n):
+...     return Just(n // 2) if n % 2 == 0 else Nothing
+>>> sink = MemorySink()
+>>> with instrumenting(sink):
+...     Just(8) >> half >> half >> half >> half
+Nothing
+>>> stats = sink.stats()['monad.instrument.half']
+>>> stats.count, stats.short_circuits
+(4, 1)
+"""
+
+import logging
+from collections import deque
+from contextlib import contextmanager
+from threading import Lock
+
+from .types import Monad, Nothing, Left
+from .types.monadic import Pipeline
+from .utils import now
+
+
+def stage_name(function):
+    """Returns the name of a stage, ``module.name``."""
+    name = getattr(function, '__qualname__', None) or getattr(
+        function, '__name__', None) or type(function).__name__
+    module = getattr(function, '__module__', None)
+    return '{}.{}'.format(module, name) if module else name
+
+
+class Instrumentation(object):
+    """Times stages, and reports them to ``sink``.
+
+    ``sink`` can be any object with a method ``record(name, seconds,
+    short_circuit)``.
+    """
+    def __init__(self, sink, timer=now):
+        self.sink = sink
+        self.timer = timer
+
+    def report(self, function, start, monad):
+        """Reports a stage that returned ``monad``."""
+        elapsed = self.timer() - start
+        short_circuit = monad is Nothing or isinstance(monad, Left)
+        self.sink.record(stage_name(function), elapsed, short_circuit)
+
+    def bind(self, monad, function):
+        """Binds ``monad`` with ``function``, timed.
+
+        Binds of ``Nothing`` or a ``Left``, passed through without calling
+        ``function``, are not reported.
+        """
+        if monad is Nothing or isinstance(monad, Left):
+            return monad.bind(function)
+        start = self.timer()
+        result = monad.bind(function)
+        self.report(function, start, result)
+        return result
+
+    def call(self, function, args, kwargs):
+        """Calls ``function``, timed."""
+        # pylint: disable = star-args
+        start = self.timer()
+        result = function(*args, **kwargs)
+        self.report(function, start, result)
+        return result
+
+
+class StageStats(object):
+    """Statistics of a stage.
+
+    Percentiles are computed from the latencies of the last ``samples``
+    calls.
+    """
+    def __init__(self, samples=1024):
+        self.count = 0
+        self.total = 0.0
+        self.short_circuits = 0
+        self.latencies = deque(maxlen=samples)
+
+    def __repr__(self):
+        return 'StageStats(count={}, total={:.6f}, short_circuits={})'.format(
+            self.count, self.total, self.short_circuits)
+
+    def add(self, seconds, short_circuit):
+        """Adds a call taking ``seconds``."""
+        self.count += 1
+        self.total += seconds
+        self.short_circuits += short_circuit
+        self.latencies.append(seconds)
+
+    def percentile(self, percent):
+        """Returns the latency at ``percent``, by nearest rank."""
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        rank = int(round(percent / 100.0 * (len(latencies) - 1)))
+        return latencies[rank]
+
+    def summary(self):
+        """Returns a dict of counts, total, mean and percentile latencies."""
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'short_circuits': self.short_circuits,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+        }
+
+
+class MemorySink(object):
+    """Sink that aggregates :class:`StageStats` by stage name, in memory."""
+    def __init__(self, samples=1024):
+        self.samples = samples
+        self.stages = {}
+        self.lock = Lock()
+
+    def record(self, name, seconds, short_circuit):
+        """Adds a call of stage ``name``."""
+        with self.lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats(self.samples)
+            stats.add(seconds, short_circuit)
+
+    def stats(self):
+        """Returns a dict of stage name to :class:`StageStats`."""
+        with self.lock:
+            return dict(self.stages)
+
+    def report(self):
+        """Returns summaries of stages, the slowest in total first."""
+        stages = sorted(self.stats().items(), key=lambda item: -item[1].total)
+        return [(name, stats.summary()) for name, stats in stages]
+
+    def clear(self):
+        """Drops all statistics."""
+        with self.lock:
+            self.stages.clear()
+
+
+class LoggingSink(object):
+    """Sink that logs every call of a stage."""
+    # pylint: disable = too-few-public-methods
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def record(self, name, seconds, short_circuit):
+        """Logs a call of stage ``name``."""
+        self.logger.log(self.level, '%s took %.6fs%s', name, seconds,
+                        ', short-circuited' if short_circuit else '')
+
+
+class CallbackSink(object):
+    """Sink that calls ``callback(name, seconds, short_circuit)``."""
+    # pylint: disable = too-few-public-methods
+    def __init__(self, callback):
+        self.record = callback
+
+
+def enable(sink):
+    """Starts reporting stages to ``sink``, for all threads."""
+    instrumentation = Instrumentation(sink)
+    Monad.instrumentation = Pipeline.instrumentation = instrumentation
+    return instrumentation
+
+
+def disable():
+    """Stops reporting stages."""
+    Monad.instrumentation = Pipeline.instrumentation = None
+
+
+def enabled():
+    """Returns true if stages are being reported."""
+    return Monad.instrumentation is not None
+
+
+@contextmanager
+def instrumenting(sink):
+    """Context manager, reporting stages to ``sink`` within."""
+    previous = Monad.instrumentation
+    enable(sink)
+    try:
+        yield sink
+    finally:
+        Monad.instrumentation = Pipeline.instrumentation = previous
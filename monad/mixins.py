@@ -12,6 +12,8 @@ from .utils import identity
 class ContextManager(object):
     """Mixin class that support ``with`` statement for monad."""
     # pylint: disable = too-few-public-methods
+    __slots__ = ()
+
     def __enter__(self):
         if not self:
             raise ExtractError(self)
@@ -27,6 +29,8 @@ class ContextManager(object):
 class Ord(object):
     """Mixin class that implements rich comparison ordering methods."""
     # pylint: disable = too-few-public-methods
+    __slots__ = ()
+
     def __eq__(self, other):
         if self is other:
             return True
@@ -1,24 +1,18 @@
 # -*- coding: utf-8 -*-
 # Copyright (c) 2012-2014, Philip Xu <pyx@xrefactor.com>
 # License: BSD New, see LICENSE for details.
-"""monad.types - types"""
-
-from .null import Null
-from .lazysequence import LazySequence
-from .functor import Functor
-from .applicative import Applicative
-from .function import Function
-from .monadic import Monadic
-from .monad import Monad
-from .monadplus import MonadPlus
-from .identity import Identity
-from .maybe import Maybe, Just, Nothing
-from .either import Either, Left, Right
-from .list import List
+"""monad.types - types
+
+Types are loaded from their modules when first used, so that, for example,
+using :class:`Maybe` does not load :class:`List`.
+"""
+
+import sys
 
 __all__ = [
     'Null',
     'LazySequence',
+    'WindowedSequence',
     'Functor',
     'Applicative',
     'Function',
@@ -34,3 +28,47 @@ __all__ = [
     'Right',
     'List',
 ]
+
+#: Modules defining the types, relative to this package.
+MODULES = {
+    'Null': 'null',
+    'LazySequence': 'lazysequence',
+    'WindowedSequence': 'lazysequence',
+    'Functor': 'functor',
+    'Applicative': 'applicative',
+    'Function': 'function',
+    'Monadic': 'monadic',
+    'Monad': 'monad',
+    'MonadPlus': 'monadplus',
+    'Identity': 'identity',
+    'Maybe': 'maybe',
+    'Just': 'maybe',
+    'Nothing': 'maybe',
+    'Either': 'either',
+    'Left': 'either',
+    'Right': 'either',
+    'List': 'list',
+}
+
+
+def __getattr__(name):
+    """Imports types on first access, see PEP 562."""
+    if name not in MODULES:
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(__name__, name))
+    # __import__ rather than importlib, so that -X importtime reports it
+    module = __import__(MODULES[name], globals(), None, [name], 1)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(MODULES))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    # no module __getattr__, load everything, in order of dependency
+    for _name in __all__:
+        globals()[_name] = __getattr__(_name)
+    del _name
@@ -14,6 +14,8 @@ class Applicative(Functor):
     - ``unit`` which act as constructor, it's called ``pure`` in some context.
     """
     # pylint: disable = abstract-method, too-few-public-methods
+    __slots__ = ()
+
     #: The unit.
     #:
     #: Maps a value to a value in this type.
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+"""monad.types.asynchronous - Monads with coroutine functions.
+
+This module requires Python 3.5 or higher, it is not imported by
+:mod:`monad.types`.
+
+Binding a coroutine function with ``>>`` wraps an un-awaited coroutine in
+the result, the helpers here await it instead, with the same short-circuit
+rules as ``bind``:
+
+>>> import asyncio
+>>> from monad.types import Just, Nothing
+>>> async def half(n):
+...     return Just(n // 2) if n % 2 == 0 else Nothing
+>>> loop = asyncio.new_event_loop()
+>>> loop.run_until_complete(Just(8).abind(half))
+Just(4)
+>>> chain = AsyncMaybe.unit(8) >> half >> half >> half
+>>> loop.run_until_complete(chain)
+Just(1)
+>>> loop.run_until_complete(chain >> half)
+Nothing
+>>> loop.close()
+"""
+
+import asyncio
+from inspect import isawaitable
+
+from . import Monadic, Just, Nothing, Left, Right
+from .monadic import Pipeline
+
+# get_event_loop is deprecated in coroutines, get_running_loop is new in 3.7
+get_running_loop = getattr(
+    asyncio, 'get_running_loop', asyncio.get_event_loop)
+
+
+async def abind(monad, function):
+    """Binds ``monad`` with ``function``, awaits the result if awaitable.
+
+    ``function`` can be a coroutine function, or a function returning a
+    monad directly.  It works with monads whose ``bind`` calls ``function``
+    once, at most, and returns its result, such as :class:`Identity`,
+    :class:`Maybe` and :class:`Either`.
+    """
+    monad = monad.bind(function)
+    if isawaitable(monad):
+        monad = await monad
+    return monad
+
+
+async def afirst(awaitables, default=Nothing, predicate=None):
+    """Returns the first ``Just`` of ``awaitables``, in order of completion.
+
+    Same as :func:`monad.actions.first`, for results of awaitables, run
+    concurrently, those raising exceptions are skipped.  Once a result is
+    found, the remaining ones are cancelled.
+
+    >>> import asyncio
+    >>> async def lookup(delay, result):
+    ...     await asyncio.sleep(delay)
+    ...     return result
+    >>> loop = asyncio.new_event_loop()
+    >>> loop.run_until_complete(afirst([lookup(0.5, Just('slow')),
+    ...                                 lookup(0.0, Nothing),
+    ...                                 lookup(0.1, Just('fast'))]))
+    Just('fast')
+    >>> loop.close()
+    """
+    if predicate is None:
+        predicate = lambda m: m and isinstance(m, Just)
+
+    pending = set(asyncio.ensure_future(each) for each in awaitables)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED)
+            # exceptions of all tasks done are retrieved, not to be logged
+            results = [task.result() for task in done
+                       if not task.cancelled() and task.exception() is None]
+            for item in results:
+                if predicate(item):
+                    return item if isinstance(item, Just) else Just(item)
+    finally:
+        for task in pending:
+            task.cancel()
+    return default
+
+
+def atryout(*functions, timeout=None, hedge=None):
+    """Combines coroutine functions into one, like
+    :func:`monad.actions.tryout` with an executor.
+
+    Returns an :class:`AsyncMonadic` coroutine function, that when called,
+    calls ``functions`` in order, the next one is started as soon as the
+    previous one returns a false value, raises an exception, takes longer
+    than ``timeout`` seconds, then cancelled, or longer than ``hedge``
+    seconds, then left running.  The first true value is returned, and the
+    others cancelled.  Otherwise the last false value, or the last exception
+    raised, by those not timed out, or :exc:`asyncio.TimeoutError` if all
+    of them timed out.
+
+    >>> import asyncio
+    >>> async def slow(key):
+    ...     await asyncio.sleep(1)
+    ...     return 'slow'
+    >>> async def fast(key):
+    ...     return 'fast'
+    >>> loop = asyncio.new_event_loop()
+    >>> loop.run_until_complete(atryout(slow, fast, hedge=0.01)('key'))
+    'fast'
+    >>> try:
+    ...     loop.run_until_complete(atryout(slow, timeout=0.01)('key'))
+    ... except asyncio.TimeoutError:
+    ...     print('timed out')
+    timed out
+    >>> loop.close()
+    """
+    async def trying(*args, **kwargs):
+        """Coroutine function that try out functions concurrently."""
+        # pylint: disable = too-many-branches
+        loop = get_running_loop()
+        candidates = iter(functions)
+        running = {}
+        last_result, last_error = None, None
+        # whether any candidate returned or raised, or timed out
+        answered = timed_out = False
+
+        def start():
+            """Starts the next candidate, returns false if there is none."""
+            for candidate in candidates:
+                task = asyncio.ensure_future(candidate(*args, **kwargs))
+                running[task] = (None if timeout is None
+                                 else loop.time() + timeout)
+                return True
+            return False
+
+        last_start = loop.time()
+        remaining = start()
+        try:
+            while running:
+                wakeups = [deadline for deadline in running.values()
+                           if deadline is not None]
+                if hedge is not None and remaining:
+                    wakeups.append(last_start + hedge)
+                wait_for = (max(min(wakeups) - loop.time(), 0)
+                            if wakeups else None)
+                done, _ = await asyncio.wait(
+                    list(running), timeout=wait_for,
+                    return_when=asyncio.FIRST_COMPLETED)
+                start_next = False
+                for task in done:
+                    del running[task]
+                    start_next = answered = True
+                    if task.cancelled():
+                        continue
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+                    if task.result():
+                        return task.result()
+                    last_result, last_error = task.result(), None
+                current = loop.time()
+                for task, deadline in list(running.items()):
+                    if deadline is not None and deadline <= current:
+                        task.cancel()
+                        del running[task]
+                        start_next = timed_out = True
+                if hedge is not None and current >= last_start + hedge:
+                    start_next = True
+                if start_next and remaining:
+                    last_start = current
+                    remaining = start()
+        finally:
+            for task in running:
+                task.cancel()
+        if timed_out and not answered:
+            raise asyncio.TimeoutError()
+        if last_error is not None:
+            raise last_error
+        return last_result
+    return AsyncMonadic(trying)
+
+
+class Async(object):
+    """Awaitable chain of binds, of a monad, or of an awaitable of monad.
+
+    Functions are bound with ``>>`` as usual, they run when the chain is
+    awaited, coroutine functions are awaited in turn.  Once a stage
+    produces ``Nothing`` or a ``Left``, the remaining stages are skipped.
+    """
+    __slots__ = ('monad', 'stages')
+
+    def __init__(self, monad, stages=()):
+        self.monad = monad
+        self.stages = stages
+
+    def __rshift__(self, function):
+        """The bind operator ``>>``"""
+        if not callable(function):
+            return NotImplemented
+        return type(self)(self.monad, self.stages + (function,))
+
+    def __await__(self):
+        return self.evaluate().__await__()
+
+    def __repr__(self):
+        return '{}({!r}, {} stages)'.format(
+            type(self).__name__, self.monad, len(self.stages))
+
+    async def evaluate(self):
+        """Awaits the monad, and binds it with all the stages."""
+        monad = self.monad
+        if isawaitable(monad):
+            monad = await monad
+        for stage in self.stages:
+            if monad is Nothing or type(monad) is Left:
+                break
+            monad = monad.bind(stage)
+            if isawaitable(monad):
+                monad = await monad
+        return monad
+
+    @classmethod
+    def unit(cls, value):
+        """Wraps ``value`` in the monad of this chain."""
+        return cls(cls.monad_type(value))
+
+    #: The monad ``unit`` wraps values in.
+    monad_type = None
+
+
+class AsyncMaybe(Async):
+    """:class:`Async` chain of :class:`Maybe`."""
+    __slots__ = ()
+    monad_type = Just
+
+
+class AsyncEither(Async):
+    """:class:`Async` chain of :class:`Either`."""
+    __slots__ = ()
+    monad_type = Right
+
+
+class AsyncPipeline(Pipeline):
+    """:class:`Pipeline` of monadic functions, coroutine functions or not.
+
+    Calling it returns a coroutine.  Unlike :class:`Pipeline`, it is neither
+    timed by :mod:`monad.instrument`, nor traced by :mod:`monad.provenance`.
+    """
+    # pylint: disable = too-few-public-methods
+    async def __call__(self, *args, **kwargs):
+        # pylint: disable = star-args
+        nothing, left = self.nothing, self.left
+        stages = self.flattened or self.stages
+        monad = stages[0](*args, **kwargs)
+        if isawaitable(monad):
+            monad = await monad
+        for stage in stages[1:]:
+            if monad is nothing or type(monad) is left:
+                break
+            monad = monad.bind(stage)
+            if isawaitable(monad):
+                monad = await monad
+        return monad
+
+
+class AsyncMonadic(Monadic):
+    """Monadic function wrapper, with Kleisli composition of coroutines.
+
+    >>> import asyncio
+    >>> from monad.types import Left, Right
+    >>> @AsyncMonadic
+    ... async def parse(text):
+    ...     return Right(int(text)) if text.isdigit() else Left(text)
+    >>> inverse = lambda n: Right(1.0 / n) if n else Left('zero')
+    >>> loop = asyncio.new_event_loop()
+    >>> loop.run_until_complete((parse >> inverse)('4'))
+    Right(0.25)
+    >>> loop.run_until_complete((parse >> inverse)('0'))
+    Left('zero')
+    >>> loop.run_until_complete((parse >> inverse)('x'))
+    Left('x')
+    >>> loop.close()
+    """
+    # pylint: disable = too-few-public-methods
+    def __rshift__(self, monadic):
+        """Left-to-right Kleisli composition of monads. ``>>``"""
+        if not callable(monadic):
+            return NotImplemented
+        return self.__class__(AsyncPipeline(self, monadic))
+
+    def __rrshift__(self, monadic):
+        """Kleisli composition, with a synchronous monadic function first."""
+        if not callable(monadic):
+            return NotImplemented
+        return self.__class__(AsyncPipeline(monadic, self))
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+"""monad.types.batch - Vectorized Maybe and Either, backed by NumPy.
+
+This module requires NumPy, it is not imported by :mod:`monad.types`.
+"""
+
+import numpy
+
+from . import Just, Nothing, Left, Right
+
+
+class MaskedBatch(object):
+    """Column of values with a validity mask, base of batch types.
+
+    Functions passed to ``fmap`` and ``bind`` are called once, with an array
+    of the values in valid lanes only.
+    """
+    __slots__ = ('values', 'mask')
+
+    def __init__(self, values, mask=None):
+        self.values = numpy.asarray(values)
+        if mask is None:
+            mask = numpy.ones(len(self.values), dtype=bool)
+        self.mask = numpy.asarray(mask, dtype=bool)
+        if self.mask.shape != self.values.shape[:1]:
+            raise ValueError('mask and values must have the same length')
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __repr__(self):
+        return '{}([{}])'.format(
+            type(self).__name__, ', '.join(repr(m) for m in self))
+
+    def __rshift__(self, function):
+        """The bind operator ``>>``"""
+        if not callable(function):
+            return NotImplemented
+        return self.bind(function)
+
+    def __rlshift__(self, function):
+        """The inverted bind operator ``<<``"""
+        if not callable(function):
+            return NotImplemented
+        return self.bind(function)
+
+    def valid(self):
+        """Returns values in valid lanes."""
+        return self.values[self.mask]
+
+    def spread(self, valid_values):
+        """Returns a new values array, ``valid_values`` in valid lanes."""
+        valid_values = numpy.asarray(valid_values)
+        values = numpy.zeros(
+            (len(self),) + valid_values.shape[1:], dtype=valid_values.dtype)
+        values[self.mask] = valid_values
+        return values
+
+    def fmap(self, function):
+        """Applies ``function`` to valid lanes, as an array, in one call."""
+        return self.__class__(self.spread(function(self.valid())),
+                              self.mask.copy())
+
+    def to_list(self):
+        """Converts to a list of monads."""
+        raise NotImplementedError
+
+
+class MaybeArray(MaskedBatch):
+    """Column of :class:`Maybe` values, valid lanes are :class:`Just`.
+
+    >>> a = MaybeArray.from_list([Just(1), Nothing, Just(4)])
+    >>> a
+    MaybeArray([Just(1), Nothing, Just(4)])
+    >>> a.fmap(numpy.sqrt)
+    MaybeArray([Just(1.0), Nothing, Just(2.0)])
+    >>> positive = lambda v: MaybeArray(v - 2, v > 2)
+    >>> a >> positive
+    MaybeArray([Nothing, Nothing, Just(2)])
+
+    The function given to ``bind`` takes an array of values in valid lanes,
+    and returns a :class:`MaybeArray` of the same length.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_list(cls, maybes, fill=0, dtype=None):
+        """Creates from :class:`Maybe` values, ``fill`` stands for Nothing."""
+        maybes = list(maybes)
+        values = [fill if m is Nothing else m.value for m in maybes]
+        mask = [m is not Nothing for m in maybes]
+        return cls(numpy.array(values, dtype=dtype), mask)
+
+    def to_list(self):
+        """Converts to a list of :class:`Just` and :data:`Nothing`."""
+        return [Just(v) if m else Nothing
+                for v, m in zip(self.values.tolist(), self.mask.tolist())]
+
+    def bind(self, function):
+        """Binds valid lanes, invalid lanes stay :data:`Nothing`."""
+        result = function(self.valid())
+        mask = self.mask.copy()
+        mask[self.mask] = result.mask
+        return self.__class__(self.spread(result.values), mask)
+
+
+class EitherArray(MaskedBatch):
+    """Column of :class:`Either` values, valid lanes are :class:`Right`.
+
+    Values of :class:`Left` are kept in ``lefts``, an array of objects.
+
+    >>> a = EitherArray.from_list([Right(1), Left('bad'), Right(-4)])
+    >>> a
+    EitherArray([Right(1), Left('bad'), Right(-4)])
+    >>> a.fmap(numpy.negative)
+    EitherArray([Right(-1), Left('bad'), Right(4)])
+    >>> def positive(v):
+    ...     return EitherArray.where(v > 0, v, 'negative')
+    >>> a >> positive
+    EitherArray([Right(1), Left('bad'), Left('negative')])
+
+    The function given to ``bind`` takes an array of values in valid lanes,
+    and returns an :class:`EitherArray` of the same length.
+    """
+    __slots__ = ('lefts',)
+
+    def __init__(self, values, mask=None, lefts=None):
+        super(EitherArray, self).__init__(values, mask)
+        if lefts is None:
+            lefts = numpy.empty(len(self.values), dtype=object)
+        self.lefts = lefts
+
+    @classmethod
+    def from_list(cls, eithers, fill=0, dtype=None):
+        """Creates from :class:`Either` values, ``fill`` stands for Left."""
+        eithers = list(eithers)
+        mask = [isinstance(e, Right) for e in eithers]
+        values = [e.value if m else fill for e, m in zip(eithers, mask)]
+        lefts = numpy.empty(len(eithers), dtype=object)
+        lefts[:] = [None if m else e.value for e, m in zip(eithers, mask)]
+        return cls(numpy.array(values, dtype=dtype), mask, lefts)
+
+    @classmethod
+    def where(cls, condition, values, left):
+        """Right of ``values`` where ``condition``, ``Left(left)`` otherwise.
+        """
+        condition = numpy.asarray(condition, dtype=bool)
+        lefts = numpy.empty(len(condition), dtype=object)
+        lefts[~condition] = left
+        return cls(values, condition, lefts)
+
+    def to_list(self):
+        """Converts to a list of :class:`Right` and :class:`Left`."""
+        return [Right(v) if m else Left(l) for v, m, l in zip(
+            self.values.tolist(), self.mask.tolist(), self.lefts)]
+
+    def fmap(self, function):
+        """Applies ``function`` to valid lanes, as an array, in one call."""
+        return self.__class__(self.spread(function(self.valid())),
+                              self.mask.copy(), self.lefts.copy())
+
+    def bind(self, function):
+        """Binds valid lanes, :class:`Left` lanes stay unchanged."""
+        result = function(self.valid())
+        lanes = numpy.flatnonzero(self.mask)
+        mask = self.mask.copy()
+        mask[lanes] = result.mask
+        lefts = self.lefts.copy()
+        failed = ~result.mask
+        lefts[lanes[failed]] = result.lefts[failed]
+        return self.__class__(self.spread(result.values), mask, lefts)
@@ -73,6 +73,8 @@ class Either(Monad, ContextManager, Ord):
     >>> Right(-2) < Right(-1)
     True
     """
+    __slots__ = ()
+
     def __init__(self, value):
         super(Either, self).__init__(value)
         if type(self) is Either:
@@ -109,6 +111,8 @@ class Either(Monad, ContextManager, Ord):
 
 class Left(Either):
     """Left of :py:class:`Either`."""
+    __slots__ = ()
+
     def __bool__(self):
         # pylint: disable = no-self-use
         return False
@@ -117,6 +121,7 @@ class Left(Either):
 
 class Right(Either):
     """Right of :py:class:`Either`."""
+    __slots__ = ()
 
 
 Either.unit = Monadic(Right)
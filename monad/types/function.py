@@ -3,7 +3,36 @@
 # License: BSD New, see LICENSE for details.
 """monad.types.function - The Function Wrapper."""
 
-from ..utils import compose
+
+class Composition(object):
+    """Functions composed, applied from first to last in a single loop.
+
+    ``Composition((f, g, h))`` behaves like ``lambda x: h(g(f(x)))``.
+    """
+    # pylint: disable = too-few-public-methods
+    def __init__(self, functions):
+        self.functions = functions
+        # same as the lambda returned by compose, which this replaces
+        self.__name__ = '<lambda>'
+        self.__doc__ = None
+
+    def __call__(self, *args, **kwargs):
+        # pylint: disable = star-args
+        functions = self.functions
+        value = functions[0](*args, **kwargs)
+        for function in functions[1:]:
+            value = function(value)
+        return value
+
+
+def pipeline_of(function):
+    """Returns functions composed in ``function``, in order of application.
+    """
+    if isinstance(function, Function):
+        function = function.function
+    if isinstance(function, Composition):
+        return function.functions
+    return (function,)
 
 
 class Function(object):
@@ -21,6 +50,9 @@ class Function(object):
     >>> inc2 = int | add_1 | add_1 | str
     >>> inc2('42')
     '44'
+
+    Composed functions are kept flat, calling ``inc2`` calls the four
+    functions in a loop, instead of through nested functions.
     """
     # pylint: disable = too-few-public-methods
     def __init__(self, callable_object):
@@ -33,13 +65,15 @@ class Function(object):
         return self.function(*args, **kwargs)
 
     def __mul__(self, other):
-        return self.__class__(compose(self.function, other))
+        return self.__class__(
+            Composition(pipeline_of(other) + pipeline_of(self)))
 
     def __ror__(self, other):
         return self.__mul__(other)
 
     def __rmul__(self, other):
-        return self.__class__(compose(other, self.function))
+        return self.__class__(
+            Composition(pipeline_of(self) + pipeline_of(other)))
 
     def __or__(self, other):
         return self.__rmul__(other)
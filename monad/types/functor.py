@@ -13,9 +13,15 @@ class Functor(object):
         fmap (f . g)  ==  fmap f . fmap g
     """
     # pylint: disable = too-few-public-methods
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
+    def __reduce__(self):
+        """Pickled as a call of the type with the value."""
+        return type(self), (self.value,)
+
     def fmap(self, function):
         """The fmap operation."""
         raise NotImplementedError
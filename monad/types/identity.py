@@ -22,5 +22,7 @@ class Identity(Monad, ContextManager, Ord):
     >>> Identity(42) == Identity(24)
     False
     """
+    __slots__ = ()
+
     def bind(self, function):
         return function(self.value)
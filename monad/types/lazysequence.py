@@ -3,11 +3,44 @@
 # License: BSD New, see LICENSE for details.
 """monad.types.lazysequence - a sequence type with lazy evaluation."""
 
-from collections import Sequence
+from collections import Mapping, Sequence, Set, deque
 from functools import total_ordering
-from itertools import islice
+from itertools import count, islice
+from threading import RLock
 
-from ..utils import suppress
+from ..exceptions import EvictedError
+
+try:
+    from operator import length_hint
+except ImportError:  # pragma: no cover
+    def length_hint(obj, default=0):
+        """Fallback of ``operator.length_hint`` for python < 3.4."""
+        try:
+            return len(obj)
+        except TypeError:
+            return default
+
+#: Sentinel for the end of evaluation.
+FINISHED = object()
+
+#: Types whose length is known without evaluating anything.
+EAGER = (list, tuple, type(range(0)), Set, Mapping)
+
+#: Types wrapping a ``LazySequence`` as their ``value``, ``List`` adds itself
+#: when loaded, so that it is not imported here.
+WRAPPERS = ()
+
+
+def known_length(iterable):
+    """Returns the length of ``iterable`` if known without evaluating it,
+    ``None`` otherwise."""
+    if isinstance(iterable, EAGER):
+        return len(iterable)
+    if isinstance(iterable, LazySequence):
+        return iterable.length
+    if isinstance(iterable, WRAPPERS):
+        return iterable.value.length
+    return None
 
 
 @total_ordering
@@ -22,37 +55,62 @@ class LazySequence(Sequence):
     [3, 4]
     >>> list(seq[:20:2])
     [0, 2, 4, 6, 8, 10, 12, 14, 16, 18]
+
+    The length is known without evaluation if ``iterable`` has a length, it
+    is assumed not to change afterwards.
+
+    >>> seq = LazySequence(set('abc'))
+    >>> len(seq)
+    3
+    >>> seq.items
+    []
+
+    It is safe to share among threads, items are evaluated once, in order,
+    by one thread at a time, and cached items are read without locking.
     """
     def __init__(self, iterable):
-        self.iterable = iter(iterable)
-        self.items = []
+        self.length = known_length(iterable)
+        if isinstance(iterable, (list, tuple)):
+            # nothing to evaluate, copied so that the length holds
+            self.iterable = None
+            self.items = list(iterable)
+        else:
+            self.iterable = iter(iterable)
+            self.items = []
+        # guards evaluation, reentrant in case the source reads this
+        self.lock = None if self.iterable is None else RLock()
 
     def __getitem__(self, index):
         if isinstance(index, slice):
             iterable = islice(self, index.start, index.stop, index.step)
             return self.__class__(iterable)
 
-        if self.iterable is None:
-            # that's all we have
-            return self.items[index]
-
-        item_numbers = len(self.items)
-        finished = object()
-
-        # get until enough
-        while index < 0 or index >= item_numbers:
-            next_item = next(self.iterable, finished)
-            if next_item is finished:
-                self.iterable = None
-                break
-            self.items.append(next_item)
-            item_numbers += 1
-
+        if self.iterable is not None and not 0 <= index < len(self.items):
+            self.evaluate_until(index)
         return self.items[index]
 
+    def __iter__(self):
+        if self.iterable is None:
+            # all evaluated, as fast as iterating over a list
+            return iter(self.items)
+        return self.evaluate()
+
     def __len__(self):
+        if self.length is not None:
+            return self.length
         return len(self.strict.items)
 
+    def __reduce__(self):
+        """Pickles the items, evaluating all of them."""
+        return type(self), (self.strict.items,)
+
+    def __length_hint__(self):
+        if self.length is not None:
+            return self.length
+        if self.iterable is None:
+            return len(self.items)
+        return len(self.items) + length_hint(self.iterable)
+
     def __eq__(self, other):
         if self is other:
             return True
@@ -70,11 +128,211 @@ class LazySequence(Sequence):
             fmt = "unorderable types: {} and {}'".format
             raise TypeError(fmt(type(self), type(other)))
 
+    def evaluate(self):
+        """Iterates over items, evaluates and caches them when necessary."""
+        items = self.items
+        acquire, release = self.lock.acquire, self.lock.release
+        index = 0
+        while True:
+            if index < len(items):
+                # cached, or evaluated by another consumer meanwhile
+                yield items[index]
+                index += 1
+                continue
+            if self.iterable is None:
+                # items are appended before the source is dropped
+                if index < len(items):
+                    continue
+                return
+            acquire()
+            try:
+                iterable = self.iterable
+                if index == len(items) and iterable is not None:
+                    item = next(iterable, FINISHED)
+                    if item is FINISHED:
+                        self.iterable = None
+                    else:
+                        items.append(item)
+            finally:
+                release()
+
+    def evaluate_until(self, index):
+        """Evaluates items up to ``index``, all of them if negative."""
+        items = self.items
+        with self.lock:
+            iterable = self.iterable
+            while iterable is not None and (index < 0 or index >= len(items)):
+                item = next(iterable, FINISHED)
+                if item is FINISHED:
+                    self.iterable = iterable = None
+                else:
+                    items.append(item)
+
+    @property
+    def started(self):
+        """Whether any item has been evaluated."""
+        return bool(self.items) or self.iterable is None
+
     @property
     def strict(self):
         """Proxy to self that forces evaluation when accessed."""
         if self.iterable is not None:
             # force consume all items from self.iterable first
-            with suppress(IndexError):
-                id(self[-1])
+            self.evaluate_until(-1)
+        return self
+
+    #: The maximum number of items kept, ``None`` means unbounded.
+    window = None
+
+
+class WindowedSequence(LazySequence):
+    """Sequence with lazy evaluation, keeping only the last ``window`` items.
+
+    Use this to stream through sources too large to be kept in memory,
+    accessing an item no longer kept raises :class:`EvictedError`.  With
+    ``window`` of ``0``, items can only be consumed once, in order.
+
+    Unless known from ``iterable``, the length is unknown until all items are
+    evaluated, ``len`` raises ``TypeError`` before that, unlike other
+    sequences, so that ``list`` and friends fall back to iteration, instead
+    of evaluating all items, which would evict them.  Use
+    ``operator.length_hint`` for an estimate, or :attr:`strict` to evaluate
+    all items first.
+
+    >>> from itertools import count
+    >>> seq = WindowedSequence(count(), 3)
+    >>> seq[10]
+    10
+    >>> seq[8]
+    8
+    >>> seq[7]  # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    EvictedError: item 7 has been evicted, only the last 3 kept
+    >>> list(seq[20:24])
+    [20, 21, 22, 23]
+    """
+    def __init__(self, iterable, window):
+        # pylint: disable = super-init-not-called
+        self.length = known_length(iterable)
+        self.iterable = iter(iterable)
+        self.items = deque(maxlen=window)
+        self.window = window
+        self.lock = RLock()
+        #: Number of items evaluated so far.
+        self.pulled = 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.__class__(self.islice(index), self.window)
+
+        item = self.fetch(index)
+        if item is FINISHED:
+            raise IndexError('sequence index out of range')
+        return item
+
+    def __iter__(self):
+        for index in count():
+            item = self.fetch(index)
+            if item is FINISHED:
+                return
+            yield item
+
+    def __len__(self):
+        if self.length is not None:
+            return self.length
+        if self.iterable is not None:
+            # so that list() and friends fall back to iteration
+            raise TypeError('length unknown until fully evaluated')
+        return self.pulled
+
+    def __reduce__(self):
+        """Pickles the items, evaluating all of them, none evicted yet."""
+        return type(self), (list(self), self.window)
+
+    def __length_hint__(self):
+        if self.length is not None:
+            return self.length
+        if self.iterable is None:
+            return self.pulled
+        return self.pulled + length_hint(self.iterable)
+
+    def __bool__(self):
+        return self.pulled > 0 or self.pull() is not FINISHED
+    __nonzero__ = __bool__
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        elif isinstance(other, LazySequence):
+            return list(self) == list(other)
+        else:
+            return NotImplemented
+
+    def __lt__(self, other):
+        if self is other:
+            return False
+        elif isinstance(other, LazySequence):
+            return list(self) < list(other)
+        else:
+            fmt = "unorderable types: {} and {}'".format
+            raise TypeError(fmt(type(self), type(other)))
+
+    def islice(self, index):
+        """Iterates over a slice, starting at where it starts."""
+        start, stop, step = index.start or 0, index.stop, index.step or 1
+        if start < 0 or (stop is not None and stop < 0) or step < 1:
+            raise ValueError('negative index or step is not supported')
+        for position in count(start, step):
+            if stop is not None and position >= stop:
+                return
+            item = self.fetch(position)
+            if item is FINISHED:
+                return
+            yield item
+
+    def fetch(self, index):
+        """Returns the item at ``index``, ``FINISHED`` if there is none."""
+        with self.lock:
+            # held throughout, so that no item is pulled meanwhile
+            if index < 0:
+                self.pull_all()
+                index += self.pulled
+                if index < 0:
+                    return FINISHED
+            while index >= self.pulled:
+                item = self.pull()
+                if item is FINISHED or index == self.pulled - 1:
+                    # the item pulled, in case it is not kept
+                    return item
+            evicted = self.pulled - len(self.items)
+            if index < evicted:
+                raise EvictedError(index, self.window)
+            return self.items[index - evicted]
+
+    def pull(self):
+        """Evaluates the next item, returns ``FINISHED`` if there is none."""
+        with self.lock:
+            if self.iterable is not None:
+                for item in self.iterable:
+                    self.items.append(item)
+                    self.pulled += 1
+                    return item
+                self.iterable = None
+            return FINISHED
+
+    def pull_all(self):
+        """Evaluates all remaining items, keeping only the last ones."""
+        while self.pull() is not FINISHED:
+            pass
+
+    @property
+    def started(self):
+        """Whether any item has been evaluated."""
+        return self.pulled > 0 or self.iterable is None
+
+    @property
+    def strict(self):
+        """Proxy to self that forces evaluation when accessed."""
+        self.pull_all()
         return self
@@ -3,11 +3,121 @@
 # License: BSD New, see LICENSE for details.
 """monad.types.list - The List Monad."""
 
-from collections import Sequence
-from itertools import chain
+from collections import Sequence, deque
+from functools import partial
+from itertools import chain, islice
+from weakref import ref
 
-from . import LazySequence, MonadPlus
+from . import LazySequence, MonadPlus, WindowedSequence, lazysequence
 from ..mixins import Ord
+from ..utils import identity
+
+
+def flat_map(source, stages):
+    """Feeds items from ``source`` through ``stages``, depth first.
+
+    Each stage is a pair of ``(function, mapping)``, ``function`` maps an
+    item to a new item if ``mapping`` is true, or to an iterable of new items
+    otherwise.  This is equivalent to nesting a generator per stage, in one
+    loop, without intermediate caching.
+    """
+    depth = len(stages)
+    pending = [(iter(source), 0)]
+    while pending:
+        iterator, start = pending[-1]
+        for item in iterator:
+            level = start
+            while level < depth:
+                function, mapping = stages[level]
+                level += 1
+                if mapping:
+                    item = function(item)
+                else:
+                    pending.append((iter(function(item)), level))
+                    break
+            else:
+                yield item
+                continue
+            break
+        else:
+            pending.pop()
+
+
+class Lineage(object):
+    """How a ``List`` is computed from the ``List`` it is derived from.
+
+    ``parent`` is either the items of that ``List``, to be read from its
+    cache, or, if its stages are lent, its ``Lineage``.  Lent stages are run
+    again only if that ``List`` can no longer be evaluated by anyone else,
+    that is, when its items are gone, before being evaluated.
+    """
+    def __init__(self, parent, stage):
+        self.parent = parent
+        self.stage = stage
+        #: Weak reference to the items of the ``List`` computed.
+        self.reference = None
+        #: The items, kept alive once they are being evaluated.
+        self.items = None
+        #: Whether the stages are lent to a derived ``List``.
+        self.lent = False
+
+    def resolve(self):
+        """Returns the source and the stages to compute the items from."""
+        lineage, stages = self, []
+        while True:
+            stages.append(lineage.stage)
+            parent = lineage.parent
+            if not isinstance(parent, Lineage):
+                break
+            items = parent.items
+            if items is None:
+                items = parent.reference()
+            if items is not None:
+                # still readable, so might be evaluated, read its cache
+                parent = items
+                break
+            lineage = parent
+        stages.reverse()
+        return parent, tuple(stages)
+
+
+def run(lineage):
+    """Yields the fused loop computing items of ``lineage``, once."""
+    lineage.items = lineage.reference()
+    yield flat_map(*lineage.resolve())
+
+
+def ordered_map(executor, function, source, in_flight):
+    """Maps ``function`` over ``source`` by ``executor``, in order.
+
+    At most ``in_flight`` calls are submitted ahead of the item being
+    yielded, so ``source`` can be infinite.  Pending calls are cancelled if
+    the generator is closed before exhausted.
+    """
+    if in_flight < 1:
+        raise ValueError('in_flight must be at least 1')
+    pending = deque()
+    items = iter(source)
+    try:
+        for item in items:
+            pending.append(executor.submit(function, item))
+            if len(pending) >= in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def from_items(cls, items, window):
+    """Creates ``List`` of ``cls``, with ``window``, used by pickle."""
+    return cls.from_iterable(items, window)
+
+
+def evaluate(function, item):
+    """Calls ``function`` on ``item``, collects the items it returns."""
+    return list(function(item))
 
 
 class List(MonadPlus, Ord, Sequence):
@@ -39,7 +149,9 @@ class List(MonadPlus, Ord, Sequence):
     >>> list(m[1000:1002])
     [1000, 1001]
 
-    Bind operation with ``>>``
+    Bind operation with ``>>``, successive ``fmap`` and ``bind`` on a
+    ``List`` not yet evaluated, and not kept, are fused into a single loop
+    over the original source, so only the final ``List`` caches its items.
 
     >>> spawn = lambda cell: List(cell, cell)
     >>> spawn('c')
@@ -67,39 +179,172 @@ class List(MonadPlus, Ord, Sequence):
     def __getitem__(self, index):
         items = self.value.__getitem__(index)
         if isinstance(index, slice):
-            return self.from_iterable(items)
+            return self.from_iterable(items, self.value.window)
         return items
 
+    def __iter__(self):
+        return iter(self.value)
+
     def __len__(self):
         return len(self.value)
 
-    def __nonzero__(self):
-        return len(self.value)
+    def __length_hint__(self):
+        return self.value.__length_hint__()
+
+    def __bool__(self):
+        return bool(self.value)
+    __nonzero__ = __bool__
+
+    def __reduce__(self):
+        """Pickles the items, evaluating all of them.
+
+        To send a long or infinite ``List`` in parts, see :meth:`chunks`.
+        """
+        if self.value.window is None:
+            return type(self), tuple(self)
+        return from_items, (type(self), tuple(self), self.value.window)
 
     def __repr__(self):
         """Customized Show."""
         return 'List({})'.format(', '.join(repr(x) for x in self))
 
     @classmethod
-    def from_iterable(cls, iterator):
-        """Creates ``List`` from iterable."""
+    def from_iterable(cls, iterator, window=None):
+        """Creates ``List`` from iterable.
+
+        If ``window`` is set, only the last ``window`` items evaluated are
+        kept, to stream through ``iterator`` in constant memory, see
+        :class:`WindowedSequence`.  ``List`` derived from this one, by
+        ``bind``, ``fmap``, ``join``, ``plus`` or slicing, use the same
+        ``window``.
+
+        >>> from itertools import count
+        >>> stream = List.from_iterable(count(), window=0)
+        >>> evens = stream >> (lambda n: List(n) if n % 2 == 0 else List())
+        >>> evens[10000]
+        20000
+        """
         instance = cls.unit()
-        instance.value = LazySequence(iterator)
+        if window is None:
+            instance.value = LazySequence(iterator)
+        else:
+            instance.value = WindowedSequence(iterator, window)
         return instance
 
+    def bind(self, function):
+        """bind of List Monad.
+
+        See :meth:`fuse`, on how ``function`` is called on items of a
+        ``List`` derived from another one.
+        """
+        # producers can provide their iterable without wrapping it in List
+        return self.fuse(getattr(function, 'iterate', function), False)
+
     def fmap(self, function):
-        """fmap of List Monad."""
-        return self.from_iterable(function(i) for i in self)
+        """fmap of List Monad, see :meth:`bind`."""
+        return self.fuse(function, True)
 
     def join(self):
         """join of List Monad."""
-        return self.from_iterable(chain.from_iterable(self))
+        return self.fuse(identity, False)
+
+    def fuse(self, function, mapping):
+        """Creates ``List`` by adding a stage to the computation of this one.
+
+        If this ``List`` is derived from another one, and has not been
+        evaluated yet, its stages are lent to the first ``List`` derived from
+        it.  When that ``List`` is evaluated, if the items of this one are
+        gone, not kept by this ``List`` or anything else, the stages are
+        fused into a single loop over the original source, otherwise the
+        items cached here are read, so that no stage is run twice:
+
+        >>> calls = []
+        >>> def record(n):
+        ...     calls.append(n)
+        ...     return n
+        >>> m = List(1, 2, 3).fmap(record)
+        >>> first, second = m.fmap(str), m.fmap(str)
+        >>> first, second, m
+        (List('1', '2', '3'), List('1', '2', '3'), List(1, 2, 3))
+        >>> len(calls)
+        3
+        """
+        value, parent = self.value, self.value
+        if self.lineage is not None and value.lock is not None:
+            with value.lock:
+                if not (self.lineage.lent or value.started):
+                    self.lineage.lent = True
+                    parent = self.lineage
+        lineage = Lineage(parent, (function, mapping))
+        instance = self.from_iterable(
+            chain.from_iterable(run(lineage)), value.window)
+        lineage.reference = ref(instance.value)
+        instance.lineage = lineage
+        if mapping:
+            # one item out for each item in, so is the length
+            instance.value.length = value.length
+        return instance
+
+    def par_fmap(self, function, executor, in_flight=8):
+        """fmap, with ``function`` called by ``executor``.
+
+        Returns a lazy ``List``, items are in the same order as in this one.
+        Calls are submitted as the result is evaluated, with up to
+        ``in_flight`` of them ahead of the item being evaluated.
+        """
+        if in_flight < 1:
+            raise ValueError('in_flight must be at least 1')
+        instance = self.from_iterable(
+            ordered_map(executor, function, self.value, in_flight),
+            self.value.window)
+        instance.value.length = self.value.length
+        return instance
+
+    def par_bind(self, function, executor, in_flight=8):
+        """bind, with ``function`` called by ``executor``.
+
+        Items of the ``List`` returned by ``function`` are collected by the
+        executor too, the order of items is the same as with ``bind``.
+        See :meth:`par_fmap`.
+        """
+        if in_flight < 1:
+            raise ValueError('in_flight must be at least 1')
+        function = partial(evaluate, getattr(function, 'iterate', function))
+        return self.from_iterable(
+            chain.from_iterable(
+                ordered_map(executor, function, self.value, in_flight)),
+            self.value.window)
+
+    def chunks(self, size):
+        """Yields evaluated ``List`` of ``size`` items, the last may have
+        fewer, to be pickled one by one.
+
+        >>> from itertools import count
+        >>> parts = List.from_iterable(count()).chunks(3)
+        >>> next(parts), next(parts)
+        (List(0, 1, 2), List(3, 4, 5))
+        >>> List.from_iterable(chain.from_iterable(parts))[:4]
+        List(6, 7, 8, 9)
+        """
+        iterator = iter(self)
+        while True:
+            chunk = tuple(islice(iterator, size))
+            if not chunk:
+                return
+            yield type(self)(*chunk)
 
     def plus(self, monad):
         """plus operation, concatenates two ``List``."""
         if not isinstance(monad, type(self)):
             return NotImplemented
-        return self.from_iterable(chain(self, monad))
+        instance = self.from_iterable(chain(self, monad), self.value.window)
+        if self.value.length is not None and monad.value.length is not None:
+            instance.value.length = self.value.length + monad.value.length
+        return instance
+
+    #: How this ``List`` is computed from another one, if derived.
+    lineage = None
 
 
 List.zero = List()
+lazysequence.WRAPPERS += (List,)
@@ -57,6 +57,8 @@ class Maybe(MonadPlus, ContextManager, Ord):
     >>> Nothing == Nothing
     True
     """
+    __slots__ = ()
+
     @classmethod
     def from_value(cls, value):
         """Wraps ``value`` in a :class:`Maybe` monad.
@@ -77,6 +79,12 @@ class Maybe(MonadPlus, ContextManager, Ord):
         return self is not Nothing
     __nonzero__ = __bool__
 
+    def __reduce__(self):
+        """Pickled by name if :data:`Nothing`, unpickled as the singleton."""
+        if self is Nothing:
+            return 'Nothing'
+        return super(Maybe, self).__reduce__()
+
     def __repr__(self):
         """Customized Show."""
         if self is Nothing:
@@ -7,6 +7,11 @@ from . import Applicative
 from ..utils import identity
 
 
+#: Classes using the default ``bind``, to whether they overload both ``fmap``
+#: and ``join``.
+COMPLETE = {}
+
+
 class Unit(object):
     """Descriptor that always return the owner monad, used for ``unit``."""
     # pylint: disable = too-few-public-methods
@@ -30,23 +35,39 @@ class Monad(Applicative):
     recursive, subclasses should at least either overload ``bind``, or
     ``fmap`` and ``join``, or all of them for better performance.
     """
+    __slots__ = ()
+
     # Bind Operators
     def __rshift__(self, function):
         """The bind operator ``>>``"""
         if not callable(function):
             return NotImplemented
+        if self.instrumentation is not None:
+            return self.instrumentation.bind(self, function)
         return self.bind(function)
 
     def __rlshift__(self, function):
         """The inverted bind operator ``<<``"""
         if not callable(function):
             return NotImplemented
+        if self.instrumentation is not None:
+            return self.instrumentation.bind(self, function)
         return self.bind(function)
 
     def __repr__(self):
         return '{cls}({value})'.format(
             cls=type(self).__name__, value=repr(self.value))
 
+    def abind(self, function):
+        """The bind operation, awaitable, for coroutine functions.
+
+        Returns a coroutine, see :func:`monad.types.asynchronous.abind`,
+        which requires Python 3.5 or higher.
+        """
+        # import here, the module is not available before Python 3.5
+        from .asynchronous import abind
+        return abind(self, function)
+
     def bind(self, function):
         """The bind operation.
 
@@ -55,8 +76,20 @@ class Monad(Applicative):
         term.
 
         The default implementation defines ``bind`` in terms of ``fmap`` and
-        ``join``.
+        ``join``, each called once, so it runs in constant stack.  If either
+        of them is not overloaded, they would call ``bind`` back without
+        end, a :exc:`NotImplementedError` is raised instead, checked once
+        per class.
         """
+        cls = type(self)
+        complete = COMPLETE.get(cls)
+        if complete is None:
+            complete = COMPLETE[cls] = (
+                cls.fmap != Monad.fmap and cls.join != Monad.join)
+        if not complete:
+            raise NotImplementedError(
+                '{} should overload bind, or both fmap and join'.format(
+                    cls.__name__))
         return self.fmap(function).join()
 
     def fmap(self, function):
@@ -80,3 +113,6 @@ class Monad(Applicative):
 
     #: The ``unit`` of monad.
     unit = Unit()
+
+    #: Times binds while set, see :mod:`monad.instrument`.
+    instrumentation = None
@@ -6,11 +6,95 @@
 from . import Function
 
 
+class Pipeline(object):
+    """Kleisli composition of monadic functions, executed in a single loop.
+
+    ``Pipeline(f, g)`` behaves like ``lambda x: f(x) >> g``.  Either side can
+    be a :class:`Monadic` wrapping another pipeline, which will be flattened,
+    without recursion, into a tuple of stages when first needed, so that
+    chains of any length run in constant stack.
+
+    The loop stops as soon as a stage produces ``Nothing`` or a ``Left``, as
+    binding either of them returns itself unchanged.
+    """
+    # pylint: disable = too-few-public-methods
+    def __init__(self, first, second):
+        if Pipeline.left is None:
+            # import here, these modules depend on this one
+            from .either import Left
+            from .maybe import Nothing
+            Pipeline.nothing, Pipeline.left = Nothing, Left
+        self.parts = (first, second)
+        self.flattened = None
+        # same as the lambda returned by Monadic.__rshift__, which this
+        # replaces
+        self.__name__ = '<lambda>'
+        self.__doc__ = None
+
+    def __call__(self, *args, **kwargs):
+        # pylint: disable = star-args
+        nothing, left = self.nothing, self.left
+        stages = self.flattened or self.stages
+        if self.provenance is not None and self.provenance.sample():
+            return self.provenance.trace(stages, args, kwargs)
+        if self.instrumentation is None:
+            monad = stages[0](*args, **kwargs)
+        else:
+            monad = self.instrumentation.call(stages[0], args, kwargs)
+        for stage in stages[1:]:
+            if monad is nothing or type(monad) is left:
+                break
+            monad = monad >> stage
+        return monad
+
+    @property
+    def stages(self):
+        """The functions being composed, in order of application."""
+        flattened = self.flattened
+        if flattened is None:
+            stages = []
+            pending = [self]
+            while pending:
+                stage = pending.pop()
+                if isinstance(stage, Monadic) and (
+                        type(stage).__call__ is Monadic.__call__):
+                    # not unwrapped if calling it does more than that
+                    stage = stage.function
+                if not isinstance(stage, Pipeline) or (
+                        type(stage).__call__ is not type(self).__call__):
+                    # only pipelines run the same way are merged
+                    stages.append(stage)
+                    continue
+                parts = stage.parts
+                if parts is None:
+                    # flattened already, maybe by another thread meanwhile
+                    stages.extend(stage.flattened)
+                else:
+                    pending.extend(reversed(parts))
+            flattened = self.flattened = tuple(stages)
+            # drop references to intermediate compositions, only after the
+            # stages are published, see above
+            self.parts = None
+        return flattened
+
+    #: ``Nothing`` and ``Left``, where a pipeline stops.
+    nothing = left = None
+
+    #: Times the first stage while set, see :mod:`monad.instrument`.
+    instrumentation = None
+
+    #: Traces sampled calls while set, see :mod:`monad.provenance`.
+    provenance = None
+
+
 class Monadic(Function):
     """The Monadic Function Wrapper.
 
     Implements Kleisli composition operators ``>>`` and ``<<``.  It is
     equivalent to ``(>=>)`` and ``(<=<)`` in haskell.
+
+    Chained compositions are kept flat, ``f >> g >> h`` runs ``f``, ``g`` and
+    ``h`` in one loop, instead of nesting a new function for each ``>>``.
     """
     # pylint: disable = too-few-public-methods
     def __lshift__(self, monad):
@@ -20,6 +104,11 @@ class Monadic(Function):
         """Left-to-right Kleisli composition of monads. ``>>``"""
         if not callable(monadic):
             return NotImplemented
-        # pylint: disable = star-args
-        composed = lambda *args, **kwargs: self(*args, **kwargs) >> monadic
-        return self.__class__(composed)
+        return self.__class__(Pipeline(self, monadic))
+
+    @property
+    def stages(self):
+        """The functions being composed, in order of application."""
+        if isinstance(self.function, Pipeline):
+            return self.function.stages
+        return (self.function,)
@@ -11,6 +11,8 @@ class MonadPlus(Monad):
 
     Monads that also support choice and failure.
     """
+    __slots__ = ()
+
     # Associative Operator
     def __add__(self, monad):
         """The associative operator ``+``"""
@@ -13,6 +13,10 @@ class Null(object):
     def __call__(self):
         return self
 
+    def __reduce__(self):
+        """Pickled by name, unpickled as the singleton."""
+        return 'Null'
+
 
 # pylint: disable = invalid-name
 #: The Null object.
@@ -3,7 +3,14 @@
 # License: BSD New, see LICENSE for details.
 """monad.utils - utility functions and values."""
 
-from collections import Iterable
+from collections import Iterable, OrderedDict, namedtuple
+from threading import Lock
+
+try:
+    from time import monotonic as now
+except ImportError:  # pragma: no cover
+    # python 2
+    from time import time as now
 
 
 # cannot wait for python 3.4, also do a type-check here
@@ -56,6 +63,31 @@ def compose(f, g):
     return lambda *args, **kwargs: f(g(*args, **kwargs))
 
 
+class TailCall(object):
+    """A deferred call, returned by trampolined functions, see ``trampoline``.
+    """
+    # pylint: disable = too-few-public-methods
+    __slots__ = ('function', 'args', 'kwargs')
+
+    def __init__(self, function, args, kwargs):
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+
+    def __repr__(self):
+        return 'TailCall({})'.format(
+            getattr(self.function, '__name__', repr(self.function)))
+
+    def not_in_tail_position(self, *args):
+        """Raises :exc:`TypeError`, the recursive call was not returned as
+        is, but used as a monad."""
+        raise TypeError(
+            'recursive call of trampolined {!r} is not in tail position, its '
+            'result must be returned as is, not bound'.format(
+                getattr(self.function, '__name__', self.function)))
+    __rshift__ = __rlshift__ = bind = fmap = not_in_tail_position
+
+
 def identity(a):
     """Identity function."""
     # pylint: disable = invalid-name
@@ -72,3 +104,96 @@ def ignore_exception_set(*exceptions):
             exception = (exception,)
         to_be_ignored |= set(exception)
     return to_be_ignored
+
+
+#: Statistics of :class:`LRUCache`.
+CacheInfo = namedtuple(
+    'CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+class LRUCache(object):
+    """Thread-safe mapping of bounded size, least recently used evicted.
+
+    If ``ttl`` is set, entries older than ``ttl`` seconds are discarded when
+    looked up, and counted as a miss and an eviction.
+
+    >>> cache = LRUCache(2)
+    >>> cache.put('a', 1)
+    >>> cache.put('b', 2)
+    >>> cache.get('a')
+    1
+    >>> cache.put('c', 3)
+    >>> cache.get('b') is None
+    True
+    >>> cache.info()
+    CacheInfo(hits=1, misses=1, evictions=1, maxsize=2, currsize=2)
+    """
+    def __init__(self, maxsize=128, ttl=None, timer=now):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        """Returns value of ``key``, marks it as most recently used."""
+        with self.lock:
+            try:
+                expiry, value = self.entries.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            if expiry is not None and expiry <= self.timer():
+                self.misses += 1
+                self.evictions += 1
+                return default
+            self.entries[key] = expiry, value
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Sets ``key`` to ``value``, evicts the least recently used."""
+        expiry = None if self.ttl is None else self.timer() + self.ttl
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = expiry, value
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Removes all entries, and resets statistics."""
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """Returns :class:`CacheInfo`, the statistics of this cache."""
+        with self.lock:
+            return CacheInfo(self.hits, self.misses, self.evictions,
+                             self.maxsize, len(self.entries))
+
+
+def strip_traceback(exception):
+    """Drops tracebacks of ``exception``, and of those chained to it.
+
+    Returns ``exception``, which no longer keeps the frames it was raised
+    through alive.
+    """
+    pending, seen = [exception], set()
+    while pending:
+        current = pending.pop()
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+        if getattr(current, '__traceback__', None) is not None:
+            current.__traceback__ = None
+        pending.append(getattr(current, '__cause__', None))
+        pending.append(getattr(current, '__context__', None))
+    return exception
@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+from threading import Event
+from time import sleep
+
+import pytest
+
+from monad.actions import adaptive_tryout, first_completed, tryout
+from monad.actions import foldM, mapM_, sequence, traverse
+from monad.decorators import failsafe, maybe
+from monad.types import Just, Left, Monadic, Nothing, Right
+
+
+class Clock(object):
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+    def costing(self, result, seconds, calls=None):
+        def candidate(key):
+            if calls is not None:
+                calls.append(result)
+            self.time += seconds
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return candidate
+
+
+def returning(result, delay=0, calls=None):
+    def candidate(key):
+        if calls is not None:
+            calls.append(result)
+        sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return candidate
+
+
+@pytest.fixture
+def executor():
+    futures = pytest.importorskip('concurrent.futures')
+    with futures.ThreadPoolExecutor(4) as pool:
+        yield pool
+
+
+def test_tryout_sequential_by_default():
+    calls = []
+    test = tryout(returning(0, calls=calls), returning('a', calls=calls),
+                  returning('b', calls=calls))
+    assert isinstance(test, Monadic)
+    assert test('key') == 'a'
+    assert calls == [0, 'a']
+    assert tryout(returning(0), returning(''))('key') == ''
+    with pytest.raises(ValueError):
+        tryout(returning(ValueError()), returning('a'))('key')
+
+    with pytest.raises(TypeError):
+        tryout(returning(1), timeout=1)
+    with pytest.raises(TypeError):
+        tryout(returning(1), retries=1)
+
+
+def test_tryout_by_executor(executor):
+    calls = []
+    test = tryout(returning(0, calls=calls), returning('a', calls=calls),
+                  returning('b', calls=calls), executor=executor)
+    assert test('key') == 'a'
+    assert calls == [0, 'a']
+
+    test = tryout(returning(ValueError()), returning('a'), executor=executor)
+    assert test('key') == 'a'
+    test = tryout(returning(ValueError()), returning(0), executor=executor)
+    assert test('key') == 0
+    test = tryout(returning(0), returning(KeyError()), executor=executor)
+    with pytest.raises(KeyError):
+        test('key')
+
+
+def test_tryout_timeout(executor):
+    futures = pytest.importorskip('concurrent.futures')
+    test = tryout(returning('slow', 1), returning('fallback'),
+                  executor=executor, timeout=0.05)
+    assert test('key') == 'fallback'
+
+    test = tryout(returning('slow', 1), executor=executor, timeout=0.01)
+    with pytest.raises(futures.TimeoutError):
+        test('key')
+
+
+def test_tryout_timeout_after_a_false_value(executor):
+    futures = pytest.importorskip('concurrent.futures')
+    test = tryout(returning(0), returning('slow', 0.5), executor=executor,
+                  timeout=0.05)
+    assert test('key') == 0
+    test = tryout(returning(ValueError()), returning('slow', 0.5),
+                  executor=executor, timeout=0.05)
+    with pytest.raises(ValueError):
+        test('key')
+    test = tryout(returning('slow', 0.5), returning('slow', 0.5),
+                  executor=executor, timeout=0.05)
+    with pytest.raises(futures.TimeoutError):
+        test('key')
+
+
+def test_tryout_hedge(executor):
+    release = Event()
+
+    def stuck(key):
+        release.wait()
+        return 'stuck'
+
+    try:
+        calls = []
+        test = tryout(stuck, returning('hedged', calls=calls),
+                      executor=executor, hedge=0.01)
+        assert test('key') == 'hedged'
+
+        # a slow candidate is not abandoned, its result is still taken
+        test = tryout(returning('first', 0.1), returning(0, calls=calls),
+                      executor=executor, hedge=0.01)
+        assert test('key') == 'first'
+        assert calls == ['hedged', 0]
+
+        # all started at once, the fastest true result wins
+        test = tryout(returning('slow', 0.2), returning('fast', 0.01),
+                      executor=executor, hedge=0)
+        assert test('key') == 'fast'
+    finally:
+        release.set()
+
+
+def test_tryout_cancels_the_rest():
+    futures = pytest.importorskip('concurrent.futures')
+    class ManualExecutor(futures.Executor):
+        """Runs the second call only, the rest stay pending."""
+        def __init__(self):
+            self.submitted = []
+
+        def submit(self, fn, *args, **kwargs):
+            future = futures.Future()
+            if len(self.submitted) == 1:
+                future.set_result(fn(*args, **kwargs))
+            self.submitted.append(future)
+            return future
+
+    executor = ManualExecutor()
+    test = tryout(returning('a'), returning('b'), returning('c'),
+                  executor=executor, hedge=0)
+    assert test('key') == 'b'
+    assert [f.cancelled() for f in executor.submitted] == [True, False]
+
+
+def test_adaptive_tryout_reorders():
+    clock, calls = Clock(), []
+    test = adaptive_tryout(clock.costing(0, 1, calls),
+                           clock.costing(0, 1, calls),
+                           clock.costing('third', 1, calls),
+                           timer=clock)
+    assert isinstance(test, Monadic)
+    assert test('key') == 'third'
+    assert calls == [0, 0, 'third']
+    del calls[:]
+    assert test('key') == 'third'
+    assert calls == ['third']
+    stats = test.candidates.stats
+    assert [s.calls for s in stats] == [1, 1, 2]
+    assert stats[2].success_rate == 0.75
+    assert stats[2].mean_seconds == 1
+
+
+def test_adaptive_tryout_cost():
+    clock = Clock()
+    # cheap but rarely successful, against slow but reliable
+    flaky = clock.costing(0, 0.1)
+    slow = clock.costing('slow', 1)
+    test = adaptive_tryout(slow, flaky, timer=clock)
+    for _ in range(20):
+        assert test('key') == 'slow'
+    first, second = test.candidates.order()
+    assert first.function is slow
+    assert second.function is flaky
+    # the cheap one is tried first, until its failures outweigh its cost
+    calls = second.calls
+    assert 1 < calls < 20
+    for _ in range(20):
+        assert test('key') == 'slow'
+    assert second.calls == calls
+
+
+def test_adaptive_tryout_decay():
+    clock = Clock()
+    results = {'a': 'a', 'b': 0}
+
+    def switching(name):
+        def candidate(key):
+            clock.time += 1
+            return results[name]
+        return candidate
+
+    test = adaptive_tryout(switching('b'), switching('a'), half_life=10,
+                           timer=clock)
+    for _ in range(20):
+        assert test('key') == 'a'
+    a, b = test.candidates.stats[1], test.candidates.stats[0]
+    assert test.candidates.order() == [a, b]
+    assert a.calls < 20
+
+    results.update(a=0, b='b')
+    clock.time += 100
+    for _ in range(5):
+        assert test('key') == 'b'
+    assert test.candidates.order() == [b, a]
+
+
+def test_adaptive_tryout_pinned():
+    clock, calls = Clock(), []
+    test = adaptive_tryout(clock.costing(0, 1, calls),
+                           clock.costing('second', 1, calls),
+                           pinned=True, timer=clock)
+    for _ in range(3):
+        assert test('key') == 'second'
+    assert calls == [0, 'second'] * 3
+    assert [s.calls for s in test.candidates.stats] == [3, 3]
+
+    test.candidates.pinned = False
+    del calls[:]
+    assert test('key') == 'second'
+    assert calls == ['second']
+
+
+def test_adaptive_tryout_errors():
+    clock = Clock()
+    test = adaptive_tryout(clock.costing(ValueError(), 1),
+                           clock.costing('a', 1), timer=clock)
+    with pytest.raises(ValueError):
+        test('key')
+    failing = test.candidates.stats[0]
+    assert failing.calls == 1 and failing.successes == 0
+    assert test('key') == 'a'
+    assert test('key') == 'a'
+    with pytest.raises(TypeError):
+        adaptive_tryout(clock.costing('a', 1), executor=None)
+
+
+def test_first_completed():
+    futures = pytest.importorskip('concurrent.futures')
+
+    def lookup(delay, result):
+        sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    with futures.ThreadPoolExecutor(4) as executor:
+        submit = executor.submit
+        assert first_completed([submit(lookup, 0.3, Just(1)),
+                                submit(lookup, 0, Just(2))]) == Just(2)
+        assert first_completed([submit(lookup, 0, ValueError()),
+                                submit(lookup, 0.01, Nothing),
+                                submit(lookup, 0.02, Just(3))]) == Just(3)
+        assert first_completed([submit(lookup, 0, Nothing),
+                                submit(lookup, 0, ValueError())]) is Nothing
+        assert first_completed([], default=Just(0)) == Just(0)
+        assert first_completed([submit(lookup, 0, 0),
+                                submit(lookup, 0.01, 4)],
+                               predicate=bool) == Just(4)
+        assert first_completed([submit(lookup, 1, Just(5))],
+                               timeout=0.01) is Nothing
+
+
+def test_first_completed_cancels_pending():
+    futures = pytest.importorskip('concurrent.futures')
+    release = Event()
+
+    def blocked():
+        release.wait()
+        return Nothing
+
+    with futures.ThreadPoolExecutor(1) as executor:
+        try:
+            fast = futures.Future()
+            fast.set_result(Just('done'))
+            running = executor.submit(blocked)
+            queued = executor.submit(blocked)
+            assert first_completed([running, queued, fast]) == Just('done')
+            assert queued.cancelled()
+            assert not running.cancelled()
+        finally:
+            release.set()
+
+
+def test_sequence_of_maybe():
+    assert sequence(Just(n) for n in range(100)) == Just(list(range(100)))
+    assert sequence([Just(1), Nothing, Just(2)]) is Nothing
+    assert sequence([]) == Just([])
+
+
+def test_sequence_of_either():
+    assert sequence([Right(1), Right(2)]) == Right([1, 2])
+    assert sequence([Right(1), Left(2), Left(3)]) == Left(2)
+    assert sequence([], unit=Right) == Right([])
+
+
+def test_sequence_stops_at_first_failure():
+    def once(failure):
+        yield Just(1)
+        yield failure
+        raise Exception
+
+    assert sequence(once(Nothing)) is Nothing
+    assert sequence(once(Left('error'))) == Left('error')
+
+
+def test_traverse():
+    parse = maybe(int)
+    assert traverse(parse, ['1', '2', '3']) == Just([1, 2, 3])
+    assert traverse(parse, iter(['1', 'x', '3'])) is Nothing
+    assert traverse(parse, iter([])) == Just([])
+    # the same as binding in a loop, without the intermediate lists
+    acc = Just([])
+    for n in range(10):
+        acc = acc >> (lambda xs: Just(n * 2) >> (lambda x: Just(xs + [x])))
+    assert traverse(lambda n: Just(n * 2), range(10)) == acc
+
+    parse = failsafe(int)
+    assert traverse(parse, ['1', '2']) == Right([1, 2])
+    error = traverse(parse, iter(['1', 'x', 'y']))
+    assert isinstance(error, Left)
+    assert 'x' in str(error.value)
+
+
+def test_mapM_():
+    calls = []
+
+    def record(n):
+        calls.append(n)
+        return Just(n) if n < 3 else Nothing
+
+    assert mapM_(record, range(3)) == Just(None)
+    assert mapM_(record, range(10)) is Nothing
+    assert calls == [0, 1, 2, 0, 1, 2, 3]
+
+    check = lambda n: Right(n) if n >= 0 else Left(n)
+    assert mapM_(check, [1, 2]) == Right(None)
+    assert mapM_(Right, [1, 2]) == Right(None)
+    assert mapM_(check, [1, -2, -3]) == Left(-2)
+    assert mapM_(check, [], unit=Right) == Right(None)
+    assert mapM_(check, []) == Just(None)
+
+
+def test_foldM():
+    def safe_add(acc, n):
+        return Just(acc + n) if n >= 0 else Nothing
+
+    assert foldM(safe_add, 0, range(100)) == Just(sum(range(100)))
+    assert foldM(safe_add, 0, [1, -1, 2]) is Nothing
+    assert foldM(safe_add, 10, []) == Just(10)
+
+    divide = lambda n, d: Right(n / d) if d else Left('zero')
+    assert foldM(divide, 100, [2, 5]) == Right(10)
+    assert foldM(divide, 100, [2, 0]) == Left('zero')
+    assert foldM(divide, 100, [], unit=Right) == Right(100)
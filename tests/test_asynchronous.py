@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+import asyncio
+from functools import reduce
+from operator import rshift
+
+import pytest
+
+from monad.decorators import monadic
+from monad.types import Identity, Just, Nothing, Left, Right
+from monad.types.asynchronous import (
+    AsyncEither, AsyncMaybe, AsyncMonadic, abind)
+
+
+def run(awaitable):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(awaitable)
+    finally:
+        loop.close()
+
+
+async def maybe_inc(n):
+    await asyncio.sleep(0)
+    return Just(n + 1) if isinstance(n, int) else Nothing
+
+
+async def either_inc(n):
+    await asyncio.sleep(0)
+    return Right(n + 1) if isinstance(n, int) else Left('not int')
+
+
+def test_abind():
+    assert run(Just(1).abind(maybe_inc)) == Just(2)
+    assert run(Just('x').abind(maybe_inc)) is Nothing
+    assert run(Right(1).abind(either_inc)) == Right(2)
+    assert run(Right('x').abind(either_inc)) == Left('not int')
+    assert run(Identity(1).abind(lambda n: Identity(n * 2))) == Identity(2)
+    assert run(abind(Just(1), lambda n: Just(n * 2))) == Just(2)
+
+
+def test_abind_short_circuit():
+    called = []
+
+    async def record(n):
+        called.append(n)
+        return Just(n)
+
+    assert run(Nothing.abind(record)) is Nothing
+    error = Left('error')
+    assert run(error.abind(record)) is error
+    assert called == []
+
+
+def test_async_chain():
+    chain = AsyncMaybe.unit(0)
+    for _ in range(10):
+        chain = chain >> maybe_inc
+    assert run(chain) == Just(10)
+    # chains are immutable, and can be awaited again
+    assert run(chain >> (lambda n: Just(-n))) == Just(-10)
+    assert run(chain) == Just(10)
+
+    assert run(AsyncEither.unit(0) >> either_inc >> either_inc) == Right(2)
+    assert run(AsyncEither(Left(0)) >> either_inc) == Left(0)
+
+
+def test_async_chain_short_circuit():
+    called = []
+
+    async def record(n):
+        called.append(n)
+        return Just(n)
+
+    chain = AsyncMaybe.unit('x') >> maybe_inc >> record >> record
+    assert run(chain) is Nothing
+    chain = AsyncEither.unit('x') >> either_inc >> record
+    assert run(chain) == Left('not int')
+    assert called == []
+
+
+def test_async_chain_of_awaitable():
+    async def fetch():
+        return Right(41)
+
+    assert run(AsyncEither(fetch()) >> either_inc) == Right(42)
+
+    with pytest.raises(TypeError):
+        AsyncMaybe.unit(0) >> 1
+
+
+def test_async_kleisli_composition():
+    inc = AsyncMonadic(maybe_inc)
+    double = monadic(lambda n: Just(n * 2))
+    assert run((inc >> double >> inc)(1)) == Just(5)
+    assert run((double >> inc)(1)) == Just(3)
+    assert run((inc >> double)('x')) is Nothing
+    assert run((inc << double)(1)) == Just(3)
+
+    parse = AsyncMonadic(either_inc)
+    assert run((parse >> parse)(0)) == Right(2)
+    assert run((parse >> parse)(None)) == Left('not int')
+
+
+def test_long_async_kleisli_composition():
+    action = reduce(rshift, [AsyncMonadic(either_inc)] * 10000)
+    assert run(action(0)) == Right(10000)
+    assert len(action.stages) == 10000
+
+
+async def lookup(delay, result):
+    await asyncio.sleep(delay)
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def test_afirst_in_completion_order():
+    from monad.types.asynchronous import afirst
+    assert run(afirst([lookup(0.2, Just(1)), lookup(0.01, Just(2))])) == \
+        Just(2)
+    assert run(afirst([lookup(0.01, Nothing), lookup(0.02, Just(3))])) == \
+        Just(3)
+    assert run(afirst([lookup(0, ValueError()), lookup(0.01, Just(4))])) == \
+        Just(4)
+    assert run(afirst([lookup(0, Nothing), lookup(0, ValueError())])) is \
+        Nothing
+    assert run(afirst([], default=Just(0))) == Just(0)
+    assert run(afirst([lookup(0, 0), lookup(0.01, 5)], predicate=bool)) == \
+        Just(5)
+
+
+def test_afirst_cancels_the_rest():
+    from monad.types.asynchronous import afirst
+    finished = []
+
+    async def slow():
+        await asyncio.sleep(10)
+        finished.append(True)
+        return Just('slow')
+
+    async def race():
+        task = asyncio.ensure_future(slow())
+        result = await afirst([task, lookup(0, Just('fast'))])
+        await asyncio.sleep(0)
+        return result, task.cancelled()
+
+    assert run(race()) == (Just('fast'), True)
+    assert finished == []
+
+
+def test_atryout():
+    from monad.types.asynchronous import atryout
+    calls = []
+
+    def returning(result, delay=0):
+        async def candidate(key):
+            calls.append(result)
+            await lookup(delay, None)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return candidate
+
+    assert isinstance(atryout(returning(1)), AsyncMonadic)
+    assert run(atryout(returning(0), returning('a'), returning('b'))('k')) \
+        == 'a'
+    assert calls == [0, 'a']
+    assert run(atryout(returning(ValueError()), returning(0))('k')) == 0
+    with pytest.raises(KeyError):
+        run(atryout(returning(0), returning(KeyError()))('k'))
+    assert run(atryout(returning('slow', 1), returning('fallback'),
+                       timeout=0.01)('k')) == 'fallback'
+    del calls[:]
+    assert run(atryout(returning('slow', 0.2), returning('fast', 0.01),
+                       hedge=0)('k')) == 'fast'
+    assert run(atryout(returning('first', 0.05), returning(0),
+                       hedge=0.01)('k')) == 'first'
+    assert calls == ['slow', 'fast', 'first', 0]
+
+
+def test_atryout_timeout_after_a_false_value():
+    import asyncio
+    from monad.types.asynchronous import atryout
+
+    def returning(result, delay=0):
+        async def candidate(key):
+            await lookup(delay, None)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return candidate
+
+    assert run(atryout(returning(0), returning('slow', 1),
+                       timeout=0.01)('k')) == 0
+    with pytest.raises(ValueError):
+        run(atryout(returning(ValueError()), returning('slow', 1),
+                    timeout=0.01)('k'))
+    with pytest.raises(asyncio.TimeoutError):
+        run(atryout(returning('slow', 1), returning('slow', 1),
+                    timeout=0.01)('k'))
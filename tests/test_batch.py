@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+from monad.types import Just, Nothing, Left, Right
+from monad.types.batch import EitherArray, MaybeArray
+
+test_range = range(-100, 100)
+
+
+def maybe_reciprocal(n):
+    return Nothing if n == 0 else Just(1.0 / n)
+
+
+def batch_reciprocal(values):
+    valid = values != 0
+    safe = numpy.where(valid, values, 1)
+    return MaybeArray(1.0 / safe, valid)
+
+
+def either_sqrt(n):
+    return Left('negative') if n < 0 else Right(n ** 0.5)
+
+
+def batch_sqrt(values):
+    return EitherArray.where(values >= 0, numpy.sqrt(numpy.abs(values)),
+                             'negative')
+
+
+def test_maybe_array_round_trip():
+    maybes = [maybe_reciprocal(n) for n in test_range]
+    assert MaybeArray.from_list(maybes).to_list() == maybes
+    assert list(MaybeArray.from_list(maybes)) == maybes
+
+
+def test_maybe_array_fmap():
+    maybes = [maybe_reciprocal(n) for n in test_range]
+    batch = MaybeArray.from_list(maybes).fmap(lambda v: v * 2)
+    assert batch.to_list() == [m.fmap(lambda v: v * 2) for m in maybes]
+
+
+def test_maybe_array_bind():
+    batch = MaybeArray(numpy.array(test_range)) >> batch_reciprocal
+    expected = [maybe_reciprocal(n) for n in test_range]
+    assert batch.to_list() == expected
+
+    # invalid lanes are never passed to bound functions
+    seen = []
+
+    def record(values):
+        seen.extend(values.tolist())
+        return MaybeArray(values)
+
+    batch >> record
+    assert len(seen) == len(test_range) - 1
+
+
+def test_either_array_round_trip():
+    eithers = [either_sqrt(n) for n in test_range]
+    assert EitherArray.from_list(eithers).to_list() == eithers
+
+
+def test_either_array_bind():
+    values = numpy.array(test_range, dtype=float)
+    batch = EitherArray(values) >> batch_sqrt
+    assert batch.to_list() == [either_sqrt(n) for n in test_range]
+
+    halve = lambda v: EitherArray.where(v < 5, v / 2, 'too big')
+    chained = batch >> halve
+    expected = [either_sqrt(n) >> (lambda v: Right(v / 2) if v < 5 else
+                                   Left('too big'))
+                for n in test_range]
+    assert chained.to_list() == expected
+
+
+def test_mask_length_check():
+    with pytest.raises(ValueError):
+        MaybeArray([1, 2, 3], [True])
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 # Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
 # License: BSD New, see LICENSE for details.
+import sys
+
 import pytest
 
 from monad.actions import either
@@ -315,3 +317,140 @@ def test_failsafe_decorator_specific_exception_tuple():
 
     assert isinstance(div(42, 0), Left)
     assert isinstance(div(-42, 2), Left)
+
+
+def test_failsafe_map_partition():
+    parse = failsafe(int)
+    rights, lefts = parse.map_partition(['1', 'x', '3', '', '5'])
+    assert rights == [(0, 1), (2, 3), (4, 5)]
+    assert [index for index, _ in lefts] == [1, 3]
+    assert all(isinstance(ex, ValueError) for _, ex in lefts)
+
+    assert parse.map_partition([]) == ([], [])
+
+
+def test_failsafe_map_partition_with_predicate_and_value():
+    @failsafe(predicate=bool, left_on_value=42)
+    def wrap(x):
+        return x
+
+    rights, lefts = wrap.map_partition([1, 0, 42, 'a', ''])
+    assert rights == [(0, 1), (3, 'a')]
+    assert lefts == [(1, 0), (2, 42), (4, '')]
+
+
+def test_failsafe_map_partition_catch_extract_error():
+    @failsafe(left_on_exception=None)
+    def check(x):
+        if x < 0:
+            raise ExtractError(Left('negative'))
+        if x == 0:
+            raise ExtractError('not a left')
+        return x
+
+    rights, lefts = check.map_partition([1, -1, 0])
+    assert rights == [(0, 1)]
+    assert lefts[0] == (1, 'negative')
+    assert lefts[1][0] == 2 and isinstance(lefts[1][1], ExtractError)
+
+    with pytest.raises(ZeroDivisionError):
+        failsafe(lambda x: 1 / x, left_on_exception=ValueError).map_partition(
+            [1, 0])
+
+
+def test_failsafe_map_partition_chunks():
+    parse = failsafe(int)
+    items = [str(n) if n % 3 else 'x' for n in range(100)]
+    rights = parse.map_partition(items)[0]
+    for chunksize in (1, 7, 100, 1000):
+        result = parse.map_partition(iter(items), chunksize=chunksize)
+        assert result[0] == rights
+        assert [index for index, _ in result[1]] == list(range(0, 100, 3))
+
+
+def test_failsafe_map_partition_with_executor():
+    futures = pytest.importorskip('concurrent.futures')
+    parse = failsafe(int)
+    items = [str(n) if n % 5 else 'x' for n in range(1000)]
+    rights, lefts = parse.map_partition(items)
+    with futures.ThreadPoolExecutor(4) as executor:
+        result = parse.map_partition(items, executor, chunksize=16)
+    assert result[0] == rights
+    assert [index for index, _ in result[1]] == [index for index, _ in lefts]
+
+
+@failsafe
+def parse_module_level(text):
+    return int(text)
+
+
+def test_failsafe_map_partition_with_process_pool():
+    futures = pytest.importorskip('concurrent.futures')
+    items = [str(n) if n % 5 else 'x' for n in range(100)]
+    rights, lefts = parse_module_level.map_partition(items)
+    with futures.ProcessPoolExecutor(2) as executor:
+        result = parse_module_level.map_partition(items, executor, 16)
+    assert result[0] == rights
+    assert [index for index, _ in result[1]] == [index for index, _ in lefts]
+    assert all(isinstance(ex, ValueError) for _, ex in result[1])
+
+
+@failsafe(left_on_value=0)
+def parse_nonzero_module_level(text):
+    return int(text)
+
+
+def test_failsafe_map_partition_agrees_with_calls():
+    items = ['1', 'x', '0', '3']
+    rights, lefts = parse_nonzero_module_level.map_partition(items)
+    results = [parse_nonzero_module_level(item) for item in items]
+    assert rights == [
+        (index, result.value) for index, result in enumerate(results)
+        if isinstance(result, Right)]
+    assert [index for index, _ in lefts] == [
+        index for index, result in enumerate(results)
+        if isinstance(result, Left)]
+
+    futures = pytest.importorskip('concurrent.futures')
+    with futures.ProcessPoolExecutor(2) as executor:
+        result = parse_nonzero_module_level.map_partition(items, executor, 2)
+    assert result[0] == rights
+    assert result[1][1] == (2, 0)
+
+
+def test_failsafe_decorator_cache():
+    calls = []
+
+    @failsafe(cache=10)
+    def parse(text):
+        calls.append(text)
+        return int(text)
+
+    assert parse('1') == parse('1') == Right(1)
+    error = parse('x')
+    assert isinstance(error.value, ValueError)
+    cached = parse('x')
+    assert parse('x') is cached
+    assert calls == ['1', 'x']
+    # the exception returned is left as is, only the memoized copy is
+    # stripped of its traceback
+    assert cached.value is not error.value
+    assert cached.value.args == error.value.args
+    if sys.version_info[0] > 2:
+        assert error.value.__traceback__ is not None
+    assert getattr(cached.value, '__traceback__', None) is None
+    assert parse.cache.info()[:3] == (3, 2, 0)
+    assert parse.map_partition(['1', '2'])[0] == [(0, 1), (1, 2)]
+
+
+def test_failsafe_decorator_cache_without_failures():
+    calls = []
+
+    @failsafe(predicate=bool, cache=10, cache_failures=False)
+    def echo(x):
+        calls.append(x)
+        return x
+
+    assert echo(0) == echo(0) == Left(0)
+    assert echo(1) == echo(1) == Right(1)
+    assert calls == [0, 0, 1]
@@ -117,3 +117,30 @@ def test_decorator():
         return int(n)
 
     assert to_int('42') == 42
+
+
+def test_composition_is_flat():
+    add_1 = Function(lambda n: n + 1)
+    double = Function(lambda n: n * 2)
+
+    composed = add_1 * double * int
+    assert composed.function.functions == (int, double.function,
+                                           add_1.function)
+    piped = int | double | (add_1 | str)
+    assert piped.function.functions == (int, double.function,
+                                        add_1.function, str)
+    assert composed('3') == 7
+    assert piped('3') == '7'
+
+
+def test_composition_attributes():
+    @function
+    def to_int(n):
+        """Converts to int."""
+        return int(n)
+
+    composed = to_int * str
+    assert composed.__name__ == '<lambda>'
+    assert composed.__doc__ is None
+    assert to_int.__name__ == 'to_int'
+    assert to_int.__doc__ == 'Converts to int.'
@@ -30,6 +30,13 @@ def test_functor_is_abstract():
         Functor(1).fmap(lambda a: a)
 
 
+def test_compact_layout():
+    for functor in [Identity(1), Maybe(1), Left(1), Right(1)]:
+        assert not hasattr(functor, '__dict__')
+        with pytest.raises(AttributeError):
+            functor.other = 1
+
+
 def test_fmap_functor_laws(functor):
     identity = lambda a: a
     f = lambda a: a + 1
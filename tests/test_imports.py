@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+import subprocess
+import sys
+
+import pytest
+
+import monad
+import monad.types
+
+#: Microseconds allowed to import all of monad, generous to avoid flakiness.
+IMPORT_BUDGET = 100000
+
+lazy = pytest.mark.skipif(sys.version_info < (3, 7),
+                          reason='module __getattr__ requires Python 3.7')
+
+
+def run(statement, *options):
+    command = [sys.executable] + list(options) + ['-c', statement]
+    return subprocess.check_output(
+        command, stderr=subprocess.STDOUT, universal_newlines=True)
+
+
+def test_top_level_api():
+    from monad.actions import either, first, tryout
+    from monad.decorators import failsafe, maybe, monadic, producer
+    from monad.types import Just, Left, List, Nothing, Right
+    assert monad.Just is Just
+    assert monad.Nothing is Nothing
+    assert monad.Left is Left and monad.Right is Right
+    assert monad.List is List
+    assert monad.maybe is maybe and monad.failsafe is failsafe
+    assert monad.monadic is monadic and monad.producer is producer
+    assert monad.either is either
+    assert monad.first is first and monad.tryout is tryout
+    for name in monad.__all__:
+        assert getattr(monad, name) is not None
+        assert name in dir(monad)
+    for name in monad.types.__all__:
+        assert getattr(monad.types, name) is not None
+
+    with pytest.raises(AttributeError):
+        monad.no_such_name
+    with pytest.raises(AttributeError):
+        monad.types.NoSuchType
+
+
+@lazy
+def test_lazy_loading():
+    output = run('import sys\n'
+                 'from monad import Just, maybe\n'
+                 'assert maybe(int)("1") == Just(1)\n'
+                 'print(" ".join(sorted(sys.modules)))')
+    loaded = output.split()
+    assert 'monad.types.maybe' in loaded
+    assert 'monad.types.list' not in loaded
+    assert 'monad.types.lazysequence' not in loaded
+    assert 'monad.actions' not in loaded
+
+
+@lazy
+def test_import_time_budget():
+    output = run('from monad import *\nimport monad.types\n'
+                 'from monad.types import *', '-X', 'importtime')
+    total = 0
+    for line in output.splitlines():
+        if line.startswith('import time:') and '[us]' not in line:
+            self_time, _, name = line[len('import time:'):].split('|')
+            if name.strip().split('.')[0] == 'monad':
+                total += int(self_time)
+    assert 0 < total < IMPORT_BUDGET
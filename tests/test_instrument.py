@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+import logging
+
+import pytest
+
+from monad import instrument
+from monad.decorators import failsafe, maybe, monadic
+from monad.instrument import (
+    CallbackSink, LoggingSink, MemorySink, StageStats, instrumenting)
+from monad.types import Just, Nothing, Left, Right
+
+
+def half(n):
+    return Just(n // 2) if n % 2 == 0 else Nothing
+
+
+def positive(n):
+    return Right(n) if n > 0 else Left(n)
+
+
+@pytest.fixture(autouse=True)
+def disabled():
+    yield
+    instrument.disable()
+
+
+def test_disabled_by_default():
+    assert not instrument.enabled()
+    assert Just(4) >> half == Just(2)
+
+
+def test_memory_sink():
+    sink = MemorySink()
+    with instrumenting(sink):
+        assert instrument.enabled()
+        assert Just(8) >> half >> half >> half >> half is Nothing
+        assert Right(1) >> positive == Right(1)
+        assert Right(0) >> positive == Left(0)
+        assert Left(-1) >> positive == Left(-1)
+    assert not instrument.enabled()
+    assert Just(2) >> half == Just(1)
+
+    stats = sink.stats()
+    assert stats[__name__ + '.half'].count == 4
+    assert stats[__name__ + '.half'].short_circuits == 1
+    # binding Left(-1) does not call positive
+    assert stats[__name__ + '.positive'].count == 2
+    assert stats[__name__ + '.positive'].short_circuits == 1
+    assert [name for name, _ in sink.report()] != []
+    sink.clear()
+    assert sink.stats() == {}
+
+
+def test_stages_after_short_circuit_not_reported():
+    sink = MemorySink()
+    calls = []
+
+    def stage(name, result):
+        def function(n):
+            calls.append(name)
+            return result
+        return function
+
+    a, b, c = stage('a', Left(0)), stage('b', Right(1)), stage('c', Right(2))
+    with instrumenting(sink):
+        assert Right(1) >> a >> b >> c == Left(0)
+    assert calls == ['a']
+    stats = sink.stats()
+    assert list(stats) == [instrument.stage_name(a)]
+    assert stats[instrument.stage_name(a)].count == 1
+    assert stats[instrument.stage_name(a)].short_circuits == 1
+
+
+def test_kleisli_composition_stages():
+    sink = MemorySink()
+    parse = maybe(int)
+    action = parse >> monadic(half) >> half
+    with instrumenting(sink):
+        assert action('8') == Just(2)
+        assert action('x') is Nothing
+        assert action('6') is Nothing
+
+    stats = sink.stats()
+    assert stats[__name__ + '.half'].count == 4
+    assert stats[__name__ + '.half'].short_circuits == 1
+    assert stats[instrument.stage_name(int)].count == 3
+    assert stats[instrument.stage_name(int)].short_circuits == 1
+    assert len(stats) == 2
+
+
+def test_stage_stats():
+    stats = StageStats(samples=100)
+    assert stats.percentile(50) is None
+    assert stats.summary()['mean'] is None
+    for n in range(1, 201):
+        stats.add(n / 1000.0, n % 10 == 0)
+    assert stats.count == 200
+    assert stats.short_circuits == 20
+    assert stats.percentile(0) == 0.101
+    assert stats.percentile(100) == 0.2
+    summary = stats.summary()
+    assert summary['p50'] == 0.151
+    assert summary['p99'] == 0.199
+    assert abs(summary['mean'] - 0.1005) < 1e-9
+
+
+def test_logging_sink(caplog):
+    logger = logging.getLogger('monad.test')
+    with caplog.at_level(logging.INFO, logger='monad.test'):
+        with instrumenting(LoggingSink(logger, logging.INFO)):
+            Right(0) >> positive
+    assert 'positive took' in caplog.text
+    assert 'short-circuited' in caplog.text
+
+
+def test_callback_sink():
+    records = []
+    with instrumenting(CallbackSink(lambda *args: records.append(args))):
+        failsafe(int)('1') >> positive
+        with instrumenting(MemorySink()):
+            Just(2) >> half
+        Just(4) >> half
+    assert [(name, short) for name, _, short in records] == [
+        (__name__ + '.positive', False),
+        (__name__ + '.half', False),
+    ]
+    assert all(seconds >= 0 for _, seconds, _ in records)
@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 # Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
 # License: BSD New, see LICENSE for details.
+import sys
 from itertools import count
+from random import Random
+from threading import Event, Thread
 
 import pytest
 
@@ -46,3 +49,131 @@ def test_lazy_sequence_ording():
 
     with pytest.raises(TypeError):
         seq < NotSeq()
+
+
+def test_lazy_sequence_interleaved_iterators():
+    numbers = LazySequence(n for n in range(10))
+    iter1 = iter(numbers)
+    assert [next(iter1) for _ in range(3)] == [0, 1, 2]
+    iter2 = iter(numbers)
+    assert [next(iter2) for _ in range(6)] == [0, 1, 2, 3, 4, 5]
+    assert next(iter1) == 3
+    assert list(iter2) == list(range(6, 10))
+    assert list(iter1) == list(range(4, 10))
+    assert list(numbers) == list(range(10))
+
+
+def test_lazy_sequence_iterator_caches_items():
+    numbers = LazySequence(n for n in [1, 1, None, None])
+    assert list(numbers) == [1, 1, None, None]
+    assert numbers.items == [1, 1, None, None]
+    assert numbers.iterable is None
+    assert list(numbers) == [1, 1, None, None]
+
+
+@pytest.fixture
+def frequent_switches():
+    if hasattr(sys, 'getswitchinterval'):
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        yield
+        sys.setswitchinterval(interval)
+    else:  # pragma: no cover
+        # python 2 switches threads every so many bytecode instructions
+        interval = sys.getcheckinterval()
+        sys.setcheckinterval(1)
+        yield
+        sys.setcheckinterval(interval)
+
+
+def counting_source(size, pulled):
+    for n in range(size):
+        pulled.append(n)
+        yield n
+
+
+def run_threads(number, target):
+    start = Event()
+    results = [None] * number
+    errors = []
+
+    def run(index):
+        start.wait()
+        try:
+            results[index] = target(index)
+        except Exception as ex:  # pylint: disable = broad-except
+            errors.append(ex)
+    threads = [Thread(target=run, args=(i,)) for i in range(number)]
+    for thread in threads:
+        thread.start()
+    start.set()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    return results
+
+
+def test_lazy_sequence_shared_by_threads(frequent_switches):
+    size = 5000
+    for _ in range(5):
+        pulled = []
+        seq = LazySequence(counting_source(size, pulled))
+        results = run_threads(16, lambda index: list(iter(seq)))
+        assert all(result == list(range(size)) for result in results)
+        assert pulled == list(range(size))
+        assert seq.items == list(range(size))
+
+
+def test_lazy_sequence_random_access_by_threads(frequent_switches):
+    size = 2000
+    pulled = []
+    seq = LazySequence(counting_source(size, pulled))
+
+    def access(index):
+        random = Random(index)
+        for _ in range(500):
+            position = random.randrange(-size, size)
+            assert seq[position] == position % size
+        if index % 2:
+            return len(seq)
+        return sum(1 for _ in seq)
+    assert run_threads(16, access) == [size] * 16
+    assert pulled == list(range(size))
+
+
+def test_list_shared_by_threads(frequent_switches):
+    from monad.types import List
+    pulled = []
+    shared = List.from_iterable(counting_source(3000, pulled))
+    doubled = shared.fmap(lambda n: n * 2)
+    results = run_threads(8, lambda index: (sum(shared), list(doubled)))
+    assert results == [(sum(range(3000)), list(range(0, 6000, 2)))] * 8
+    assert pulled == list(range(3000))
+
+
+def test_windowed_sequence_pulled_once_by_threads(frequent_switches):
+    from monad.types import WindowedSequence
+    from monad.types.lazysequence import FINISHED
+    pulled = []
+    seq = WindowedSequence(counting_source(5000, pulled), 10)
+
+    def consume(index):
+        items = []
+        item = seq.pull()
+        while item is not FINISHED:
+            items.append(item)
+            item = seq.pull()
+        return items
+    results = run_threads(8, consume)
+    assert sorted(sum(results, [])) == list(range(5000))
+    assert seq.pulled == 5000
+    assert pulled == list(range(5000))
+
+
+def test_windowed_sequence_iterated_by_threads(frequent_switches):
+    from monad.types import WindowedSequence
+    pulled = []
+    seq = WindowedSequence(counting_source(5000, pulled), 5000)
+    results = run_threads(8, lambda index: list(iter(seq)))
+    assert all(result == list(range(5000)) for result in results)
+    assert pulled == list(range(5000))
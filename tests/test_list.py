@@ -1,10 +1,15 @@
 # -*- coding: utf-8 -*-
 # Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
 # License: BSD New, see LICENSE for details.
+import gc
+import threading
+
 import pytest
 
 from monad.decorators import producer
 from monad.types import List
+from monad.types.list import Lineage
+from monad.types.lazysequence import length_hint
 
 test_range = range(-100, 100)
 unit = List.unit
@@ -51,6 +56,51 @@ def test_len():
         assert len(m) == n
 
 
+def test_known_length():
+    m = List.from_iterable(range(10 ** 9))
+    assert len(m) == 10 ** 9
+    assert len(m.fmap(str).fmap(len)) == 10 ** 9
+    assert len(unit(1, 2, 3)) == 3
+    assert len(unit(1, 2) + unit(3)) == 3
+    assert m.value.items == []
+    assert (m >> double).value.length is None
+    assert length_hint(m) == 10 ** 9
+
+    m = List.from_iterable(iter(list(range(10))))
+    assert m.value.length is None
+    assert m.__length_hint__() == 10
+    assert m[3] == 3
+    assert m.__length_hint__() == 10
+    assert m.value.iterable is not None
+
+
+def test_lazy_sources_stay_lazy():
+    from itertools import count
+
+    m = List.from_iterable(List.from_iterable(count()))
+    assert m[:3] == unit(0, 1, 2)
+    assert m.value.length is None
+
+    source = List.from_iterable(n for n in range(10))
+    m = List.from_iterable(source)
+    assert m[0] == 0
+    assert source.value.iterable is not None
+
+    source = List.from_iterable(range(5), window=2)
+    m = List.from_iterable(List.from_iterable(iter(range(5)), window=2))
+    assert list(m) == [0, 1, 2, 3, 4]
+    assert List.from_iterable(source).value.length == 5
+
+    items = list(range(10))
+    m = List.from_iterable(items)
+    assert m == List.from_iterable(iter(items)) == unit(*items)
+    assert unit(*items) < List.from_iterable(range(11))
+    # the items are copied, so the length holds
+    items.append(10)
+    assert len(m) == 10
+    assert list(m) == list(range(10))
+
+
 def test_getitem():
     rg = range(100)
     m = List.from_iterable(rg)
@@ -222,3 +272,253 @@ def test_producer_empty_on_exception():
         raise Error
 
     assert empty() == unit()
+
+
+def test_fused_bind():
+    calls = []
+
+    def spawn(n):
+        calls.append(n)
+        return unit(n, n + 1)
+
+    m = unit(1, 2)
+    fused = m >> spawn >> spawn >> add_1
+    # the intermediate List are gone, on implementations without
+    # reference counting too
+    gc.collect()
+    source, stages = fused.lineage.resolve()
+    assert source is m.value
+    assert len(stages) == 3
+    assert fused == unit(2, 3, 3, 4, 3, 4, 4, 5)
+    assert calls == [1, 1, 2, 2, 2, 3]
+
+
+def test_fused_fmap_and_join():
+    m = unit(unit(1, 2), unit(3))
+    assert m.join().fmap(str) == unit('1', '2', '3')
+    assert m.fmap(len).fmap(str) == unit('2', '1')
+
+
+def test_fusion_reuses_evaluated_list():
+    calls = []
+
+    def record(n):
+        calls.append(n)
+        return unit(n)
+
+    m = unit(1, 2, 3) >> record
+    assert list(m) == [1, 2, 3]
+    n = m >> record
+    assert n.lineage.resolve()[0] is m.value
+    assert list(n) == [1, 2, 3]
+    assert calls == [1, 2, 3, 1, 2, 3]
+
+
+def test_fusion_of_shared_list():
+    calls = []
+
+    def record(n):
+        calls.append(n)
+        return unit(n)
+
+    m = unit(1, 2, 3) >> record
+    a = m >> add_1
+    b = m.fmap(str)
+    # m is kept, so both read its items, evaluated once
+    assert a.lineage.resolve()[0] is m.value
+    assert b.lineage.resolve()[0] is m.value
+    assert a == unit(2, 3, 4)
+    assert b == unit('1', '2', '3')
+    assert m == unit(1, 2, 3)
+    assert calls == [1, 2, 3]
+
+
+def test_fusion_through_shared_prefix():
+    calls = []
+
+    def record(n):
+        calls.append(n)
+        return unit(n)
+
+    m = unit(1, 2, 3) >> record
+    a = m >> record
+    assert list(a) == [1, 2, 3]
+    assert list(m) == [1, 2, 3]
+    assert len(calls) == 6
+
+    # the items of m outlive m, in a slice, or in other derived List
+    del calls[:]
+    m = unit(1, 2, 3) >> record
+    a, b, head = m >> record, m >> record, m[:2]
+    del m
+    gc.collect()
+    assert list(a) == list(b) == [1, 2, 3]
+    assert list(head) == [1, 2]
+    assert len(calls) == 9
+
+
+def test_fusion_of_list_evaluated_then_dropped():
+    calls = []
+
+    def record(n):
+        calls.append(n)
+        return unit(n)
+
+    m = unit(1, 2, 3) >> record
+    a = m >> record
+    assert m[0] == 1
+    del m
+    gc.collect()
+    assert list(a) == [1, 2, 3]
+    assert len(calls) == 6
+
+
+def test_lent_once_among_threads():
+    calls = []
+
+    def record(n):
+        calls.append(n)
+        return unit(n)
+
+    m = unit(*range(100)) >> record
+    derived = []
+
+    def derive():
+        derived.append(m >> record)
+
+    threads = [threading.Thread(target=derive) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    del m
+    gc.collect()
+    assert sum(d.lineage.parent.__class__ is Lineage for d in derived) == 1
+    assert all(list(d) == list(range(100)) for d in derived)
+    assert len(calls) == 100 * 9
+
+
+def test_fused_producers():
+    @producer
+    def spawn(n):
+        yield n
+        yield n + 1
+
+    @producer(empty_on_exception=ValueError)
+    def parse(n):
+        return [int(n)]
+
+    assert unit(1, 3) >> spawn >> spawn == unit(1, 2, 2, 3, 3, 4, 4, 5)
+    assert unit('1', 'x', '2') >> parse >> spawn == unit(1, 2, 2, 3)
+
+
+def test_long_bind_chain():
+    m = unit(0)
+    for _ in range(10000):
+        m = m >> add_1
+    assert m == unit(10000)
+
+
+def test_windowed_stream():
+    from itertools import count
+    from monad.exceptions import EvictedError
+
+    stream = List.from_iterable(count(), window=2)
+    evens = stream >> (lambda n: unit(n) if n % 2 == 0 else zero)
+    assert evens.value.window == 2
+    assert evens[100] == 200
+    assert evens[99] == 198
+    with pytest.raises(EvictedError):
+        evens[98]
+    assert list(evens[200:203]) == [400, 402, 404]
+    assert len(stream.value.items) == 2
+
+
+def test_windowed_consume_once():
+    stream = List.from_iterable(range(5), window=0)
+    assert list(stream >> double) == [0, 0, 1, 1, 2, 2, 3, 3, 4, 4]
+    with pytest.raises(TypeError):
+        len(List.from_iterable(iter(range(5)), window=0))
+    finished = List.from_iterable(range(5), window=0)
+    finished.value.strict
+    assert len(finished) == 5
+    assert bool(List.from_iterable(range(1), window=1)) is True
+    assert bool(List.from_iterable([], window=1)) is False
+
+
+def test_par_fmap():
+    futures = pytest.importorskip('concurrent.futures')
+    from threading import current_thread
+    main = current_thread()
+    threads = set()
+
+    def double(n):
+        threads.add(current_thread())
+        return n * 2
+
+    with futures.ThreadPoolExecutor(4) as executor:
+        m = List.from_iterable(range(100)).par_fmap(double, executor)
+        assert list(m) == [n * 2 for n in range(100)]
+        assert len(m) == 100
+    assert main not in threads
+
+
+def test_par_fmap_keeps_order():
+    futures = pytest.importorskip('concurrent.futures')
+    from time import sleep
+
+    def slow_for_small(n):
+        sleep((10 - n) * 0.002)
+        return n
+
+    with futures.ThreadPoolExecutor(10) as executor:
+        m = List.from_iterable(range(10)).par_fmap(
+            slow_for_small, executor, in_flight=10)
+        assert list(m) == list(range(10))
+
+
+def test_par_bind():
+    futures = pytest.importorskip('concurrent.futures')
+
+    @producer
+    def spawn(n):
+        yield n
+        yield -n
+
+    with futures.ThreadPoolExecutor(4) as executor:
+        expected = List.from_iterable(range(50)) >> spawn
+        m = List.from_iterable(range(50))
+        assert m.par_bind(spawn, executor) == expected
+        assert m.par_bind(lambda n: List(n, -n), executor) == expected
+        assert list(m.par_bind(lambda n: List(), executor)) == []
+
+
+def test_par_bounded_in_flight():
+    futures = pytest.importorskip('concurrent.futures')
+    from itertools import count
+    calls = []
+
+    def record(n):
+        calls.append(n)
+        return n
+
+    with futures.ThreadPoolExecutor(2) as executor:
+        m = List.from_iterable(count()).par_fmap(record, executor, in_flight=3)
+        assert calls == []
+        assert m[:5] == List(0, 1, 2, 3, 4)
+    assert len(calls) <= 5 + 3
+
+    with futures.ThreadPoolExecutor(2) as executor:
+        with pytest.raises(ValueError):
+            List(1).par_fmap(record, executor, in_flight=0)
+        with pytest.raises(ValueError):
+            List(1).par_bind(List, executor, in_flight=0)
+
+
+def test_par_propagates_exception():
+    futures = pytest.importorskip('concurrent.futures')
+
+    with futures.ThreadPoolExecutor(2) as executor:
+        m = List(1, 0, 2).par_fmap(lambda n: 1 / n, executor)
+        with pytest.raises(ZeroDivisionError):
+            list(m)
@@ -290,3 +290,64 @@ def test_first_is_lazy():
         raise Exception
 
     assert first(once()) == Just(42)
+
+
+def test_maybe_decorator_cache():
+    calls = []
+
+    @maybe(cache=2)
+    def parse(text, base=10):
+        calls.append(text)
+        return int(text, base)
+
+    assert parse('42') == parse('42') == unit(42)
+    assert parse('x') is parse('x') is Nothing
+    assert calls == ['42', 'x']
+    assert parse('ff', base=16) == parse('ff', base=16) == unit(255)
+    assert parse.cache.info()[:3] == (3, 3, 1)
+    assert parse.__name__ == 'parse'
+
+
+def test_maybe_decorator_cache_options():
+    from monad.utils import LRUCache
+    calls = []
+
+    @maybe(cache=LRUCache(10), cache_failures=False)
+    def parse(text):
+        calls.append(text)
+        return int(text)
+
+    assert parse('x') is parse('x') is Nothing
+    assert parse('1') == parse('1') == unit(1)
+    assert calls == ['x', 'x', '1']
+    assert len(parse.cache) == 1
+
+    # unhashable arguments are not memoized
+    positive = maybe(lambda items: sum(items), predicate=lambda n: n > 0,
+                     cache=10)
+    assert positive([1, 2]) == unit(3)
+    assert positive([-1]) is Nothing
+    assert len(positive.cache) == 0
+
+
+def test_maybe_decorator_cache_keys():
+    @maybe(cache=10)
+    def arguments(*args, **kwargs):
+        return args, kwargs
+
+    # would be the same key, if keyword arguments were not marked
+    assert arguments(a=1) == unit(((), {'a': 1}))
+    assert arguments((), frozenset([('a', 1)])) == unit(
+        (((), frozenset([('a', 1)])), {}))
+    assert arguments(a=1, b=2) is arguments(b=2, a=1)
+    assert len(arguments.cache) == 3
+
+
+def test_maybe_decorator_checks_suppressed():
+    def fragile(n):
+        raise ValueError('predicate failed')
+
+    assert maybe(int, predicate=fragile)('1') is Nothing
+    assert maybe(int, predicate=fragile, nothing_on_value=1)('1') is Nothing
+    with pytest.raises(ValueError):
+        maybe(int, predicate=fragile, nothing_on_exception=None)('2')
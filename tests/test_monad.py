@@ -3,6 +3,8 @@
 # License: BSD New, see LICENSE for details.
 import pytest
 
+from monad.decorators import trampoline
+from monad.types import Monad
 from monad.types import Identity
 from monad.types import Maybe
 from monad.types import Either
@@ -153,3 +155,80 @@ def test_monad_law_associativity(monad):
         k = lambda a: unit(str(a))
         h = lambda a: unit(hash(a))
         assert m >> (lambda x: k(x) >> h) == (m >> k) >> h
+
+
+def test_default_bind_needs_fmap_and_join():
+    class Incomplete(Monad):
+        pass
+
+    with pytest.raises(NotImplementedError):
+        Incomplete(1) >> Incomplete
+    with pytest.raises(NotImplementedError):
+        Incomplete(1).fmap(str)
+    with pytest.raises(NotImplementedError):
+        Incomplete(1).join()
+
+
+def test_default_bind_with_fmap_and_join():
+    class Box(Monad):
+        def fmap(self, function):
+            return Box(function(self.value))
+
+        def join(self):
+            return self.value
+
+    m = Box(1)
+    for _ in range(100000):
+        m = m >> (lambda n: Box(n + 1))
+    assert m.value == 100001
+
+
+def test_trampoline():
+    for unit in [Identity, Maybe.unit, Either.unit]:
+        @trampoline
+        def countdown(n):
+            if n == 0:
+                return unit('done')
+            return unit(n - 1) >> countdown
+
+        assert countdown(100000) == unit('done')
+        # state is reset after each evaluation
+        assert countdown(10) == unit('done')
+
+
+def test_trampoline_mutual_recursion():
+    @trampoline
+    def is_even(n):
+        return Maybe.unit(True) if n == 0 else Maybe.unit(n - 1) >> is_odd
+
+    @trampoline
+    def is_odd(n):
+        return Maybe.unit(False) if n == 0 else Maybe.unit(n - 1) >> is_even
+
+    assert is_even(100000) == Maybe.unit(True)
+    assert is_odd(100001) == Maybe.unit(True)
+
+
+def test_trampoline_reset_on_exception():
+    @trampoline
+    def fail(n):
+        if n == 0:
+            raise ValueError
+        return Identity(n - 1) >> fail
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            fail(10)
+
+
+def test_trampoline_not_in_tail_position():
+    @trampoline
+    def countdown(n):
+        if n == 0:
+            return Maybe.unit(0)
+        return countdown(n - 1) >> (lambda m: Maybe.unit(m + 1))
+
+    with pytest.raises(TypeError) as error:
+        countdown(10)
+    assert 'tail position' in str(error.value)
+    assert countdown(0) == Maybe.unit(0)
@@ -1,13 +1,17 @@
 # -*- coding: utf-8 -*-
 # Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
 # License: BSD New, see LICENSE for details.
+from functools import reduce
+from operator import rshift
+
 import pytest
 
 from monad.decorators import monadic
 from monad.types import Identity
-from monad.types import Maybe
-from monad.types import Either
-from monad.types import List
+from monad.types import Maybe, Just, Nothing
+from monad.types import Either, Left, Right
+from monad.types import List, Monadic
+from monad.types.monadic import Pipeline
 
 testee = [
     Identity,
@@ -59,3 +63,86 @@ def test_chain_right_to_left_kleisli_composition(monad):
         assert double << double << m == m >> double >> double
         assert add_1 << double << m == m >> double >> add_1
         assert double << add_1 << m == m >> add_1 >> double
+
+
+def test_kleisli_composition_is_flat(monad):
+    unit = monad.unit
+    add_1 = monadic(lambda n: unit(n + 1))
+    double = monadic(lambda n: unit(n * 2))
+    action = add_1 >> double >> (add_1 >> double) >> add_1
+    assert len(action.stages) == 5
+    for n in test_range:
+        m = unit(n)
+        assert m >> action == m >> add_1 >> double >> add_1 >> double >> add_1
+
+
+def test_kleisli_composition_short_circuit():
+    calls = []
+
+    def record(unit):
+        def stage(n):
+            calls.append(n)
+            return unit(n)
+        return stage
+
+    action = monadic(lambda n: Nothing) >> record(Just) >> record(Just)
+    assert action(1) is Nothing
+    error = Left('error')
+    action = monadic(lambda n: error) >> record(Right) >> record(Right)
+    assert action(1) is error
+    assert calls == []
+
+
+def test_long_kleisli_composition():
+    for unit in [Identity.unit, Maybe.unit, Either.unit]:
+        add_1 = monadic(lambda n: unit(n + 1))
+        action = reduce(rshift, [add_1] * 100000)
+        assert len(action.stages) == 100000
+        assert action(0) == unit(100000)
+
+
+def test_pipeline_flattened_by_another_thread():
+    class Racing(Pipeline):
+        """Reads flattened as not yet set once, after being stale."""
+        stale = False
+
+        @property
+        def flattened(self):
+            if self.stale:
+                self.stale = False
+                return None
+            return self.__dict__['flattened']
+
+        @flattened.setter
+        def flattened(self, value):
+            self.__dict__['flattened'] = value
+
+    add_1 = monadic(lambda n: Just(n + 1))
+    pipeline = Racing(add_1 >> add_1, add_1)
+    stages = pipeline.stages
+    assert len(stages) == 3
+    # as if flattened by another thread, between the checks of this one
+    pipeline.stale = True
+    assert pipeline.stages == stages
+    assert pipeline(0) == Just(3)
+
+
+def test_composition_attributes():
+    add_1 = monadic(lambda n: Just(n + 1))
+    composed = add_1 >> add_1
+    assert composed.__name__ == '<lambda>'
+    assert composed.__doc__ is None
+
+
+def test_composition_keeps_overridden_call():
+    class Logged(Monadic):
+        calls = []
+
+        def __call__(self, *args, **kwargs):
+            self.calls.append(args)
+            return super(Logged, self).__call__(*args, **kwargs)
+
+    add_1 = Logged(lambda n: Just(n + 1))
+    action = monadic(lambda n: Just(n)) >> add_1 >> add_1
+    assert action(0) == Just(2)
+    assert Logged.calls == [(0,), (1,)]
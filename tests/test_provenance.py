@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+from functools import reduce
+from operator import rshift
+
+import pytest
+
+from monad import provenance
+from monad.decorators import failsafe, maybe, monadic
+from monad.provenance import Provenance, tracking
+from monad.types import Just, Nothing, Left, Right
+
+
+def half(n):
+    return Just(n // 2) if n % 2 == 0 else Nothing
+
+
+def positive(n):
+    return Right(n) if n > 0 else Left('not positive: {}'.format(n))
+
+
+@pytest.fixture(autouse=True)
+def disabled():
+    yield
+    provenance.disable()
+
+
+def test_records_failing_stage():
+    action = maybe(int) >> half >> half >> half
+    with tracking(rate=1.0) as tracked:
+        assert action('16') == Just(2)
+        assert action('x') is Nothing
+        assert action('12') is Nothing
+    assert action('6') is Nothing
+    first, second = tracked.records
+    assert first.name == 'int'
+    assert first.position == 0
+    assert first.input == (('x',), {})
+    assert second.name == 'half'
+    assert second.module == __name__
+    assert second.position == 3
+    assert second.input == 3
+    assert second.result is Nothing
+
+
+def test_records_left():
+    decrement = monadic(lambda n: Right(n - 1))
+    action = failsafe(int) >> positive >> decrement >> positive
+    with tracking(rate=1.0, size=2) as tracked:
+        assert action('2') == Right(1)
+        assert action('1') == Left('not positive: 0')
+        assert action('0') == Left('not positive: 0')
+        assert action('5') == Right(4)
+        assert isinstance(action('x').value, ValueError)
+    assert len(tracked.records) == 2
+    assert [r.position for r in tracked.records] == [1, 0]
+    assert tracked.records[0].input == 0
+    tracked.clear()
+    assert len(tracked.records) == 0
+
+
+def test_long_composition():
+    stages = [monadic(half)] * 20
+    action = reduce(rshift, stages)
+    with tracking(rate=1.0) as tracked:
+        assert action(2 ** 10) is Nothing
+    record, = tracked.records
+    assert record.position == 10
+    assert record.input == 1
+
+
+def test_sampling():
+    action = maybe(int) >> half
+    with tracking(rate=0.0) as tracked:
+        for _ in range(100):
+            assert action('1') is Nothing
+    assert len(tracked.records) == 0
+
+    with tracking(rate=0.25, seed=42) as tracked:
+        for _ in range(400):
+            assert action('1') is Nothing
+    assert 50 < len(tracked.records) <= 100
+
+    with pytest.raises(ValueError):
+        Provenance(rate=2)
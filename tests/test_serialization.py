@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2012-2015, Philip Xu <pyx@xrefactor.com>
+# License: BSD New, see LICENSE for details.
+import pickle
+from itertools import count
+
+import pytest
+
+from monad.serialization import decode_eithers, encode_eithers
+from monad.types import (
+    Identity, Just, LazySequence, Left, List, Nothing, Null, Right)
+
+protocols = range(pickle.HIGHEST_PROTOCOL + 1)
+
+
+def round_trip(obj, protocol=pickle.HIGHEST_PROTOCOL):
+    return pickle.loads(pickle.dumps(obj, protocol))
+
+
+def pytest_generate_tests(metafunc):
+    if 'protocol' in metafunc.funcargnames:
+        metafunc.parametrize('protocol', protocols)
+
+
+def test_pickle_monads(protocol):
+    for monad in (Just(1), Left('error'), Right([1, 2]), Identity(4),
+                  Just(Nothing), Right(Left(0))):
+        restored = round_trip(monad, protocol)
+        assert type(restored) is type(monad)
+        assert restored == monad
+
+
+def test_pickle_singletons(protocol):
+    assert round_trip(Nothing, protocol) is Nothing
+    assert round_trip(Null, protocol) is Null
+    assert round_trip(Just(Nothing), protocol).value is Nothing
+    inc = lambda n: Just(n + 1)
+    assert round_trip(Nothing, protocol) >> inc is Nothing
+    assert not round_trip(Nothing, protocol)
+
+
+def test_pickle_list(protocol):
+    m = List.from_iterable(n * 2 for n in range(5))
+    restored = round_trip(m, protocol)
+    assert len(restored) == 5
+    assert restored == m == List(0, 2, 4, 6, 8)
+    assert round_trip(List(), protocol) == List()
+    assert round_trip(List(List(1)), protocol) == List(List(1))
+
+    windowed = round_trip(List.from_iterable(range(5), window=2), protocol)
+    assert windowed.value.window == 2
+    assert list(windowed) == [0, 1, 2, 3, 4]
+
+    seq = round_trip(LazySequence(iter('abc')), protocol)
+    assert list(seq) == ['a', 'b', 'c']
+
+
+def test_list_chunks():
+    parts = list(List.from_iterable(iter(range(10))).chunks(4))
+    assert parts == [List(0, 1, 2, 3), List(4, 5, 6, 7), List(8, 9)]
+    assert [round_trip(part) for part in parts] == parts
+    infinite = List.from_iterable(count()).chunks(2)
+    assert next(infinite) == List(0, 1)
+    assert next(infinite) == List(2, 3)
+    assert list(List().chunks(3)) == []
+
+
+def test_pickle_across_processes():
+    futures = pytest.importorskip('concurrent.futures')
+    with futures.ProcessPoolExecutor(1) as executor:
+        results = list(executor.map(round_trip, [Nothing, Just(1), Left(2)]))
+    assert results[0] is Nothing
+    assert results[1:] == [Just(1), Left(2)]
+
+
+def test_encode_eithers():
+    eithers = [Right(n) if n % 3 else Left(str(n)) for n in range(100)]
+    data = encode_eithers(eithers)
+    assert len(data) < len(pickle.dumps(eithers, pickle.HIGHEST_PROTOCOL))
+    decoded = decode_eithers(data)
+    assert decoded == eithers
+    assert [type(e) for e in decoded] == [type(e) for e in eithers]
+    assert decode_eithers(encode_eithers(iter([]))) == []
+    assert decode_eithers(encode_eithers([Left(None)], 0)) == [Left(None)]
+
+    with pytest.raises(ValueError):
+        decode_eithers(b'XX' + data[2:])
+    with pytest.raises(ValueError):
+        decode_eithers(data[:107] + pickle.dumps([]))
@@ -3,7 +3,8 @@
 # License: BSD New, see LICENSE for details.
 import pytest
 
-from monad.utils import compose, identity, suppress
+from monad.utils import LRUCache, compose, identity, strip_traceback
+from monad.utils import suppress
 
 
 def test_compose():
@@ -86,3 +87,51 @@ def test_suppress():
     with suppress(ZeroDivisionError, TestException):
         fail()
         42 / 0
+
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    assert cache.get('a') is None
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert len(cache) == 2
+    assert cache.get('b', 'missing') == 'missing'
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions) == (3, 2, 1)
+    cache.clear()
+    assert cache.info() == (0, 0, 0, 2, 0)
+
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+
+def test_lru_cache_ttl():
+    clock = [0]
+    cache = LRUCache(2, ttl=10, timer=lambda: clock[0])
+    cache.put('a', 1)
+    clock[0] = 9
+    assert cache.get('a') == 1
+    clock[0] = 10
+    assert cache.get('a') is None
+    assert len(cache) == 0
+    assert cache.info()[:3] == (1, 1, 1)
+
+
+def test_strip_traceback():
+    try:
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            raise ValueError('chained')
+    except ValueError as ex:
+        error = ex
+    assert getattr(error, '__traceback__', None) is not None or \
+        not hasattr(error, '__traceback__')
+    assert strip_traceback(error) is error
+    assert getattr(error, '__traceback__', None) is None
+    context = getattr(error, '__context__', None)
+    assert getattr(context, '__traceback__', None) is None